@@ -1,7 +1,7 @@
 from django.contrib import admin
 from .models import (
     Member, Coach, WorkoutPlan, WorkoutSession, MemberWorkoutPlan,
-    WorkoutLog, CoachSchedule, TrainingSession, EmailLog, MemberCheckin
+    WorkoutLog, CoachSchedule, TrainingSession, EmailLog, MemberCheckin, DailyStatsSnapshot, ImportJob
 )
 
 
@@ -111,10 +111,15 @@ class EmailLogAdmin(admin.ModelAdmin):
     ]
     list_filter = ['email_type', 'status', 'sent_date']
     search_fields = ['member__full_name', 'member__email', 'email_subject']
-    readonly_fields = ['id', 'sent_date']
+    readonly_fields = ['id', 'sent_date', 'body', 'content']
+    exclude = ['email_content']
     
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('member')
+        return super().get_queryset(request).select_related('member', 'body__snapshot')
+
+    @admin.display(description='Email content')
+    def content(self, obj):
+        return obj.content
 
 
 @admin.register(MemberCheckin)
@@ -124,4 +129,27 @@ class MemberCheckinAdmin(admin.ModelAdmin):
     ]
     list_filter = ['checkin_time']
     search_fields = ['member__full_name']
-    readonly_fields = ['duration_minutes']
\ No newline at end of file
+    readonly_fields = ['duration_minutes']
+
+
+@admin.register(DailyStatsSnapshot)
+class DailyStatsSnapshotAdmin(admin.ModelAdmin):
+    list_display = [
+        'date', 'total_members', 'active_members', 'due_soon', 'overdue',
+        'new_members', 'checkins'
+    ]
+    date_hierarchy = 'date'
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = [
+        'id', 'mode', 'status', 'processed_rows', 'total_rows', 'created_count',
+        'updated_count', 'error_count', 'created_by', 'created_at'
+    ]
+    list_filter = ['status', 'mode', 'created_at']
+    readonly_fields = [
+        'id', 'status', 'total_rows', 'processed_rows', 'created_count', 'updated_count',
+        'unchanged_count', 'error_count',
+        'errors', 'error_message', 'created_at', 'started_at', 'completed_at'
+    ]
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class MembersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.members'
\ No newline at end of file
+    name = 'apps.members'
+
+    def ready(self):
+        from . import signals  # noqa: F401
\ No newline at end of file
@@ -0,0 +1,201 @@
+import gzip
+import json
+import os
+import re
+from datetime import timedelta
+from itertools import islice
+from pathlib import Path
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from .models import EmailBody, EmailLog
+import logging
+
+logger = logging.getLogger(__name__)
+
+MONTH_RE = re.compile(r'^\d{4}-\d{2}$')
+
+
+def archive_dir():
+    return Path(getattr(settings, 'EMAIL_LOG_ARCHIVE_DIR', settings.BASE_DIR / 'archive' / 'email_logs'))
+
+
+def archive_path(month):
+    return archive_dir() / f'emaillog-{month}.jsonl.gz'
+
+
+def archived_months():
+    """
+    Months (YYYY-MM) that have an archive file, newest first
+    """
+    if not archive_dir().exists():
+        return []
+    months = [
+        path.name[len('emaillog-'):-len('.jsonl.gz')]
+        for path in archive_dir().glob('emaillog-*.jsonl.gz')
+    ]
+    return sorted((month for month in months if MONTH_RE.match(month)), reverse=True)
+
+
+def _archive_row(log):
+    return {
+        'id': str(log.pk),
+        'member': str(log.member_id),
+        'member_name': log.member.full_name,
+        'member_email': log.member.email,
+        'email_type': log.email_type,
+        # Full microseconds: the encoder would truncate to milliseconds
+        'sent_date': log.sent_date.isoformat(),
+        'status': log.status,
+        'error_message': log.error_message,
+        'email_subject': log.email_subject,
+        'attempts': log.attempts,
+        'email_content': log.content,
+    }
+
+
+def _append(month, rows):
+    # Each call adds a gzip member to the file; gzip readers see one stream
+    path = archive_path(month)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'ab') as raw:
+        with gzip.GzipFile(fileobj=raw, mode='ab') as archive:
+            for row in rows:
+                archive.write((json.dumps(row, cls=DjangoJSONEncoder) + '\n').encode('utf-8'))
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+def archive_email_logs(retention_days=None, batch_size=None):
+    """
+    Move EmailLog rows older than the retention period into monthly
+    compressed archive files, then delete them from the table.
+
+    Rows go in (sent_date, id) order, `batch_size` at a time, so each month's
+    file stays in that order. Each batch is appended (and fsynced) to its
+    month's archive before it is deleted, so a crash can at worst leave a
+    row both archived and in the table; the read path drops such duplicates.
+
+    Unreferenced bodies are purged only if created before the cutoff: a
+    newer one may be about to be referenced by a log being written.
+    """
+    retention_days = retention_days or getattr(settings, 'EMAIL_LOG_RETENTION_DAYS', 180)
+    batch_size = batch_size or getattr(settings, 'EMAIL_LOG_ARCHIVE_BATCH_SIZE', 5000)
+    cutoff = timezone.now() - timedelta(days=retention_days)
+
+    archived = 0
+    while True:
+        batch = list(
+            EmailLog.objects.filter(sent_date__lt=cutoff)
+            .select_related('member', 'body__snapshot')
+            .order_by('sent_date', 'pk')[:batch_size]
+        )
+        if not batch:
+            break
+
+        by_month = {}
+        for log in batch:
+            by_month.setdefault(log.sent_date.strftime('%Y-%m'), []).append(_archive_row(log))
+        for month, rows in by_month.items():
+            _append(month, rows)
+
+        with transaction.atomic():
+            EmailLog.objects.filter(pk__in=[log.pk for log in batch]).delete()
+        archived += len(batch)
+        logger.info(f"Archived {archived} email logs older than {cutoff:%Y-%m-%d}")
+
+    # Bodies only the archived rows pointed at now live in the archive files
+    purged, _ = EmailBody.objects.filter(logs__isnull=True, created_at__lt=cutoff).delete()
+    return {'archived': archived, 'bodies_purged': purged}
+
+
+class ArchivedLogs:
+    """
+    The archived rows of one month matching some filters, newest first, as
+    a sequence the paginator can count and slice without the month being
+    loaded: the file is streamed and only the requested rows are kept.
+
+    Month files are in ascending (sent_date, id) order, so newest-first
+    positions map to ascending ones from the end. A row whose id was seen
+    earlier in the file is a duplicate a crashed archive run appended
+    again. The count takes one pass over the file and is cached for as
+    long as the file is unchanged.
+    """
+
+    def __init__(self, path, email_type=None, status=None, member=None, include_content=False):
+        self.path = path
+        self.email_type = email_type
+        self.status = status
+        self.member = str(member) if member else None
+        self.include_content = include_content
+        self._count = None
+
+    def _rows(self):
+        """
+        Matching rows in ascending order, duplicates dropped
+        """
+        seen = set()
+        with gzip.open(self.path, 'rt', encoding='utf-8') as archive:
+            for line in archive:
+                row = json.loads(line)
+                if row['id'] in seen:
+                    continue
+                seen.add(row['id'])
+                if self.email_type and row['email_type'] != self.email_type:
+                    continue
+                if self.status and row['status'] != self.status:
+                    continue
+                if self.member and row['member'] != self.member:
+                    continue
+                if not self.include_content:
+                    row.pop('email_content', None)
+                yield row
+
+    def _cache_key(self):
+        stat = self.path.stat()
+        filters = f'{self.email_type}:{self.status}:{self.member}'
+        return f'email-archive-count:{self.path.name}:{stat.st_size}:{stat.st_mtime_ns}:{filters}'
+
+    def count(self):
+        if self._count is None:
+            key = self._cache_key()
+            self._count = cache.get(key)
+            if self._count is None:
+                self._count = sum(1 for _ in self._rows())
+                cache.set(key, self._count, getattr(settings, 'EMAIL_LOG_ARCHIVE_COUNT_TTL', 3600))
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop, _ = index.indices(self.count())
+        if start >= stop:
+            return []
+        # Newest-first [start, stop) is ascending [count - stop, count - start)
+        first, last = self.count() - stop, self.count() - start
+        rows = list(islice(self._rows(), first, last))
+        rows.reverse()
+        return rows
+
+    def __iter__(self):
+        return iter(self[:])
+
+
+def read_archived_logs(month, email_type=None, status=None, member=None, include_content=False):
+    """
+    The archived rows of `month` (YYYY-MM) matching the filters, newest
+    first, as an ArchivedLogs sequence. Returns [] when the month has no
+    archive.
+    """
+    if not MONTH_RE.match(month or ''):
+        raise ValueError("Archived month must be in YYYY-MM format")
+
+    path = archive_path(month)
+    if not path.exists():
+        return []
+    return ArchivedLogs(path, email_type, status, member, include_content)
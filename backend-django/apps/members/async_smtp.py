@@ -0,0 +1,163 @@
+import asyncio
+import threading
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.mail.backends.base import BaseEmailBackend
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _import_aiosmtplib():
+    try:
+        import aiosmtplib
+    except ImportError:
+        raise ImproperlyConfigured(
+            "AsyncSMTPBackend requires aiosmtplib: pip install aiosmtplib"
+        )
+    return aiosmtplib
+
+
+class AsyncSMTPBackend(BaseEmailBackend):
+    """
+    SMTP backend that sends over a bounded pool of concurrent sessions.
+
+    The sessions live on an asyncio event loop running in a background
+    thread, so they stay open across send_messages() calls until close().
+    Each message goes out on whichever session is free: with EMAIL_ASYNC_SMTP_POOL_SIZE
+    sessions that many messages are in flight at once instead of one.
+    A session that fails is reconnected before it is reused.
+
+    send_messages_detailed() reports per message, which is what
+    CampaignMailer uses to hand over a whole batch at once:
+
+        EMAIL_CAMPAIGN_BACKEND = 'apps.members.async_smtp.AsyncSMTPBackend'
+
+    Requires the optional aiosmtplib package.
+    """
+
+    def __init__(self, host=None, port=None, username=None, password=None,
+                 use_tls=None, use_ssl=None, timeout=None, pool_size=None,
+                 fail_silently=False, **kwargs):
+        super().__init__(fail_silently=fail_silently)
+        self.aiosmtplib = _import_aiosmtplib()
+        self.host = host or settings.EMAIL_HOST
+        self.port = port or settings.EMAIL_PORT
+        self.username = settings.EMAIL_HOST_USER if username is None else username
+        self.password = settings.EMAIL_HOST_PASSWORD if password is None else password
+        self.use_tls = settings.EMAIL_USE_TLS if use_tls is None else use_tls
+        self.use_ssl = settings.EMAIL_USE_SSL if use_ssl is None else use_ssl
+        self.timeout = settings.EMAIL_TIMEOUT if timeout is None else timeout
+        self.pool_size = pool_size or getattr(settings, 'EMAIL_ASYNC_SMTP_POOL_SIZE', 10)
+        self._loop = None
+        self._thread = None
+        self._sessions = None
+
+    # Event loop plumbing
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def open(self):
+        if self._loop is not None:
+            return False
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='async-smtp', daemon=True)
+        self._thread.start()
+        self._run(self._create_pool())
+        return True
+
+    def close(self):
+        if self._loop is None:
+            return
+        try:
+            self._run(self._close_pool())
+        except Exception as e:
+            if not self.fail_silently:
+                raise
+            logger.warning(f"Error closing SMTP sessions: {str(e)}")
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = self._thread = self._sessions = None
+
+    # Sessions
+
+    def _client(self):
+        return self.aiosmtplib.SMTP(
+            hostname=self.host,
+            port=self.port,
+            username=self.username or None,
+            password=self.password or None,
+            use_tls=self.use_ssl,
+            start_tls=bool(self.use_tls),
+            timeout=self.timeout,
+        )
+
+    async def _create_pool(self):
+        # Sessions connect lazily, on their first message
+        self._sessions = asyncio.Queue()
+        for _ in range(self.pool_size):
+            self._sessions.put_nowait(self._client())
+
+    async def _close_pool(self):
+        while not self._sessions.empty():
+            client = self._sessions.get_nowait()
+            if client.is_connected:
+                try:
+                    await client.quit()
+                except self.aiosmtplib.SMTPException:
+                    client.close()
+
+    async def _send(self, message):
+        client = await self._sessions.get()
+        try:
+            if not client.is_connected:
+                await client.connect()
+            await client.send_message(
+                message.message(),
+                sender=message.from_email,
+                recipients=message.recipients(),
+            )
+            return None
+        except Exception as e:
+            # Start the next message on this slot with a fresh session
+            client.close()
+            client = self._client()
+            return e
+        finally:
+            self._sessions.put_nowait(client)
+
+    async def _send_all(self, messages):
+        return await asyncio.gather(*(self._send(message) for message in messages))
+
+    # Email backend API
+
+    def send_messages_detailed(self, email_messages):
+        """
+        Send `email_messages` concurrently over the session pool. Returns a
+        list aligned with them holding None for each message the server
+        accepted, or the exception that made it fail.
+        """
+        messages = [message for message in email_messages if message.recipients()]
+        if not messages:
+            return [None] * len(email_messages)
+
+        new_connection = self.open()
+        try:
+            errors = iter(self._run(self._send_all(messages)))
+        finally:
+            if new_connection:
+                self.close()
+        return [next(errors) if message.recipients() else None for message in email_messages]
+
+    def send_messages(self, email_messages):
+        errors = self.send_messages_detailed(email_messages)
+        failed = [error for error in errors if error is not None]
+        if failed and not self.fail_silently:
+            raise failed[0]
+        return sum(
+            1 for message, error in zip(email_messages, errors)
+            if error is None and message.recipients()
+        )
@@ -0,0 +1,177 @@
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Callable
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from .models import Member, EmailLog
+from .rendering import member_context, render_email
+
+
+# Member columns every campaign needs to render its email (see rendering.member_context)
+BASE_FIELDS = ('id', 'full_name', 'email', 'subscription_due_date', 'milestones')
+
+
+@dataclass(frozen=True)
+class Campaign:
+    """
+    Declarative definition of an automated email campaign.
+
+    segment(today)              -> Q selecting the members it targets
+    dedup_days                  -> skip members already sent this email since
+                                   midnight `dedup_days` days ago (0 = today)
+    template                    -> base name of the emails/<template>.txt/.html pair
+    extra_context(member, today) -> campaign-specific template values
+    subject(member, context)    -> the subject line
+    queue, priority             -> Celery queue and priority of its send tasks
+                                   (0 is served first, see CELERY_BROKER_TRANSPORT_OPTIONS)
+    """
+    email_type: str
+    label: str
+    summary: str
+    fallback_subject: str
+    segment: Callable[[date], Q]
+    dedup_days: int
+    template: str
+    subject: Callable[[Member, dict], str]
+    extra_context: Callable[[Member, date], dict] = lambda member, today: {}
+    extra_fields: tuple = field(default=())
+    queue: str = 'bulk'
+    priority: int = 5
+
+    @property
+    def fields(self):
+        return BASE_FIELDS + self.extra_fields
+
+    @property
+    def period_days(self):
+        return max(self.dedup_days, 1)
+
+    def send_key(self, member_id, today=None):
+        """
+        Idempotency key for emailing a member in the current period, e.g.
+        'motivational:<member id>:2026-10-12'. Periods are `dedup_days` long
+        (at least a day), so a member gets at most one sent email per key.
+        """
+        today = today or date.today()
+        period_start = date.fromordinal(today.toordinal() // self.period_days * self.period_days)
+        return f"{self.email_type}:{member_id}:{period_start.isoformat()}"
+
+    @property
+    def send_key_ttl(self):
+        # Outlives the period the key belongs to
+        return (self.period_days + 1) * 86400
+
+    def already_sent_since(self, today):
+        return timezone.make_aware(datetime.combine(today - timedelta(days=self.dedup_days), time.min))
+
+    def members(self, member_ids=None, force_send=False):
+        """
+        The members this campaign should email now, without the ones it has
+        already emailed inside the dedup window (unless force_send). The
+        dedup is a single anti-join on EmailLog rather than a query per member.
+        """
+        today = date.today()
+        queryset = Member.objects.filter(self.segment(today))
+
+        if member_ids:
+            queryset = queryset.filter(id__in=member_ids)
+
+        if not force_send:
+            already_sent = EmailLog.objects.filter(
+                member=OuterRef('pk'),
+                email_type=self.email_type,
+                status='sent',
+                sent_date__gte=self.already_sent_since(today)
+            )
+            queryset = queryset.filter(~Exists(already_sent))
+        return queryset
+
+    def build_email(self, member):
+        """
+        Returns (subject, text_content, html_content) for `member`
+        """
+        context = self.extra_context(member, date.today())
+        subject = self.subject(member, context)
+        text_content, html_content = render_email(
+            self.template, dict(context, member=member_context(member))
+        )
+        return subject, text_content, html_content
+
+
+def _birthday_age(member, today):
+    # Only when the birth year is a real one
+    if member.birthday and member.birthday.year > 1900:
+        return today.year - member.birthday.year
+    return None
+
+
+SUBSCRIPTION_REMINDER = Campaign(
+    email_type='subscription',
+    label='Subscription reminder',
+    summary='Subscription reminders',
+    fallback_subject='Subscription Reminder',
+    # Subscriptions due in the next 5 days
+    segment=lambda today: Q(
+        subscription_due_date__gte=today,
+        subscription_due_date__lte=today + timedelta(days=5),
+        is_active=True,
+    ),
+    dedup_days=1,
+    template='subscription_reminder',
+    extra_context=lambda member, today: {'days_until_due': member.days_until_due},
+    subject=lambda member, context: f"Subscription Reminder - Due in {context['days_until_due']} days",
+    queue='transactional',
+    priority=0,
+)
+
+MOTIVATIONAL_EMAIL = Campaign(
+    email_type='motivational',
+    label='Motivational email',
+    summary='Motivational emails',
+    fallback_subject='Motivational Email',
+    segment=lambda today: Q(is_active=True),
+    dedup_days=7,  # Once per week
+    template='motivational_email',
+    subject=lambda member, context: "Stay Strong! Your Fitness Journey Continues",
+    queue='bulk',
+    priority=9,
+)
+
+BIRTHDAY_WISH = Campaign(
+    email_type='birthday',
+    label='Birthday wish',
+    summary='Birthday wishes',
+    fallback_subject='Birthday Wish',
+    segment=lambda today: Member.birthday_between(today) & Q(is_active=True),
+    dedup_days=0,  # Once on the day
+    template='birthday_wish',
+    extra_context=lambda member, today: {'age': _birthday_age(member, today)},
+    subject=lambda member, context: f"Happy Birthday, {member.full_name.split()[0]}! 🎉",
+    extra_fields=('birthday',),
+    queue='transactional',
+    priority=1,
+)
+
+INACTIVITY_ALERT = Campaign(
+    email_type='inactivity',
+    label='Inactivity alert',
+    summary='Inactivity alerts',
+    fallback_subject='Inactivity Alert',
+    # Haven't checked in for 7+ days
+    segment=lambda today: Q(
+        is_active=True,
+        last_checkin_date__lt=today - timedelta(days=7),
+    ),
+    dedup_days=7,
+    template='inactivity_alert',
+    extra_context=lambda member, today: {'days_since_checkin': member.days_since_checkin},
+    subject=lambda member, context: "We Miss You! Come Back to the Gym",
+    extra_fields=('last_checkin_date',),
+    queue='bulk',
+    priority=5,
+)
+
+CAMPAIGNS = {
+    campaign.email_type: campaign
+    for campaign in (SUBSCRIPTION_REMINDER, MOTIVATIONAL_EMAIL, BIRTHDAY_WISH, INACTIVITY_ALERT)
+}
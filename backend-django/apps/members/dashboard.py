@@ -0,0 +1,54 @@
+import time
+from datetime import date
+from django.conf import settings
+from django.core.cache import cache
+
+
+def _version_key(member_id):
+    return f'member-dashboard-version:{member_id}'
+
+
+def _new_version():
+    # Never a value an evicted counter could have had recently, so a lost
+    # counter can't bring back a payload cached under it
+    return time.time_ns()
+
+
+def dashboard_version(member_id):
+    key = _version_key(member_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_dashboard_version(*member_ids):
+    """
+    Retire the cached dashboards of `member_ids`. Called by the signals of
+    the models the dashboards show (see signals.py).
+    """
+    for member_id in member_ids:
+        key = _version_key(member_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_version(), None)
+
+
+def cached_dashboard(member_id, kind, build):
+    """
+    The `kind` dashboard payload of a member, from the cache or build()
+    and cached for MEMBER_DASHBOARD_CACHE_TTL seconds.
+
+    Keys carry the member's version counter and today's date, so a bump
+    or midnight (due dates, upcoming sessions, streaks) moves on to a new
+    key and the old payload just expires.
+    """
+    version = dashboard_version(member_id)
+    key = f'member-dashboard:{kind}:{member_id}:{version}:{date.today().isoformat()}'
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, getattr(settings, 'MEMBER_DASHBOARD_CACHE_TTL', 300))
+    return data
@@ -0,0 +1,130 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from django.conf import settings
+from django.core import mail
+from django.db import transaction
+from .campaigns import CAMPAIGNS
+from .email_log import EmailLogWriter, template_snapshot
+from .mailer import CampaignMailer, build_message
+import logging
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('query', 'render', 'send', 'log')
+
+
+class StageTimer:
+    """
+    Accumulates wall time per pipeline stage:
+
+        with timer.stage('render'):
+            ...
+    """
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - started
+
+
+def dry_run_campaign(email_type, member_ids=None, force_send=False, sample_size=None):
+    """
+    Run a campaign through the real pipeline without emailing anyone, and
+    time each stage: member selection and dedup (query), rendering (render),
+    handing messages to the locmem backend (send) and writing the EmailLog
+    rows and bodies (log). Nothing is kept: the log writes happen in a
+    transaction that is rolled back.
+
+    At most `sample_size` of the eligible members are processed; the
+    per-member cost is projected onto the full eligible count, and onto the
+    outbound rate limit when one is configured.
+    """
+    campaign = CAMPAIGNS[email_type]
+    sample_size = sample_size or getattr(settings, 'EMAIL_DRY_RUN_SAMPLE_SIZE', 1000)
+    iterator_chunk_size = getattr(settings, 'EMAIL_CAMPAIGN_ITERATOR_CHUNK_SIZE', 200)
+    chunk_size = getattr(settings, 'EMAIL_CAMPAIGN_CHUNK_SIZE', 500)
+    timer = StageTimer()
+
+    with timer.stage('query'):
+        eligible_ids = list(campaign.members(member_ids, force_send).values_list('id', flat=True))
+    selection_seconds = timer.seconds['query']
+
+    with timer.stage('query'):
+        sample_ids = eligible_ids[:sample_size]
+        members = list(
+            campaign.members(sample_ids, force_send).only(*campaign.fields).iterator(chunk_size=iterator_chunk_size)
+        ) if sample_ids else []
+
+    # Created outside the rolled back transaction: the snapshot is cached for
+    # the life of the worker and real sends will reference it
+    template_snapshot(campaign.template)
+
+    connection = mail.get_connection('django.core.mail.backends.locmem.EmailBackend')
+    failed = 0
+    with transaction.atomic():
+        with CampaignMailer(connection=connection, rate_limiter=False) as mailer, \
+                EmailLogWriter() as log_writer:
+            for member in members:
+                with timer.stage('render'):
+                    try:
+                        subject, text_content, html_content = campaign.build_email(member)
+                        message = build_message(subject, text_content, html_content, member.email)
+                        error = None
+                    except Exception as e:
+                        subject, html_content, error = campaign.fallback_subject, '', e
+                if error is None:
+                    with timer.stage('send'):
+                        error = mailer.send_batch([message])[0]
+                        mail.outbox.clear()
+                with timer.stage('log'):
+                    log_writer.add(
+                        member=member,
+                        email_type=email_type,
+                        status='sent' if error is None else 'failed',
+                        error_message=str(error or ''),
+                        email_subject=subject,
+                        email_content=html_content,
+                        template=campaign.template
+                    )
+                if error is not None:
+                    failed += 1
+                    logger.warning(f"{campaign.label} dry run failed for {member.email}: {str(error)}")
+            with timer.stage('log'):
+                log_writer.flush()
+        transaction.set_rollback(True)
+
+    processed = len(members)
+    per_member = {
+        name: timer.seconds[name] / processed if processed else 0
+        for name in STAGES
+    }
+    # Selection runs once per campaign; fetching the rows scales with members
+    per_member['query'] = (timer.seconds['query'] - selection_seconds) / processed if processed else 0
+    projected = selection_seconds + sum(per_member.values()) * len(eligible_ids)
+
+    rate = getattr(settings, 'EMAIL_RATE_LIMIT', 0)
+    if rate:
+        projected = max(projected, len(eligible_ids) / rate)
+
+    result = {
+        'email_type': email_type,
+        'eligible': len(eligible_ids),
+        'processed': processed,
+        'failed': failed,
+        'chunks': -(-len(eligible_ids) // chunk_size),
+        'seconds': {name: round(timer.seconds[name], 4) for name in STAGES},
+        'ms_per_member': {name: round(per_member[name] * 1000, 3) for name in STAGES},
+        'projected_seconds': round(projected, 1),
+    }
+    logger.info(
+        f"{campaign.summary} dry run: {processed} of {len(eligible_ids)} members, "
+        f"projected {result['projected_seconds']}s on one worker"
+    )
+    return result
@@ -0,0 +1,109 @@
+import hashlib
+import time
+import zlib
+from functools import lru_cache
+from django.conf import settings
+from django.db import transaction
+from .models import EmailBody, EmailLog, EmailTemplateSnapshot
+from .rendering import get_email_template
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def template_snapshot(template_name):
+    """
+    The stored snapshot of emails/<template_name>.html as this worker
+    renders it, created the first time a body is stored from it.
+    """
+    source = get_email_template(f'emails/{template_name}.html').template.source
+    snapshot, _ = EmailTemplateSnapshot.objects.get_or_create(
+        digest=hashlib.sha256(source.encode('utf-8')).hexdigest(),
+        defaults={'name': template_name, 'source': source},
+    )
+    return snapshot
+
+
+def compress_body(template_name, html_content):
+    """
+    Build the (unsaved) EmailBody for a rendered HTML body. The template
+    source is the zlib preset dictionary, so the compressed data is roughly
+    what the recipient's content adds to the template.
+    """
+    snapshot = template_snapshot(template_name)
+    raw = html_content.encode('utf-8')
+    compressor = zlib.compressobj(level=9, zdict=snapshot.source.encode('utf-8'))
+    return EmailBody(
+        digest=hashlib.sha256(raw).hexdigest(),
+        snapshot=snapshot,
+        data=compressor.compress(raw) + compressor.flush(),
+        size=len(raw),
+    )
+
+
+def store_body(template_name, html_content):
+    body = compress_body(template_name, html_content)
+    EmailBody.objects.bulk_create([body], ignore_conflicts=True)
+    return body
+
+
+class EmailLogWriter:
+    """
+    Buffers EmailLog rows and writes them with bulk_create().
+
+    The buffer is flushed every `flush_size` rows or `flush_interval` seconds,
+    whichever comes first (checked when rows are added), and always when the
+    writer is closed. Use it as a context manager so rows still get written
+    when the task exits with an exception:
+
+        with EmailLogWriter() as log_writer:
+            log_writer.add(member=member, email_type='birthday', status='sent')
+
+    Passing `template` with `email_content` stores the body as a
+    deduplicated, compressed EmailBody instead of inline text.
+    """
+
+    def __init__(self, flush_size=None, flush_interval=None):
+        self.flush_size = flush_size or getattr(settings, 'EMAIL_LOG_FLUSH_SIZE', 500)
+        self.flush_interval = flush_interval or getattr(settings, 'EMAIL_LOG_FLUSH_INTERVAL', 5)
+        self._buffer = []
+        self._bodies = {}
+        self._last_flush = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+        return False
+
+    def add(self, template=None, **fields):
+        if template and fields.get('email_content'):
+            body = compress_body(template, fields.pop('email_content'))
+            fields['body'] = self._bodies.setdefault(body.digest, body)
+        log = EmailLog(**fields)
+        self._buffer.append(log)
+        if (len(self._buffer) >= self.flush_size
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+        return log
+
+    def flush(self):
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+
+        rows, self._buffer = self._buffer, []
+        bodies, self._bodies = list(self._bodies.values()), {}
+        try:
+            # Together, so the body purge (archive.py) can't land in between
+            with transaction.atomic():
+                # Bodies already stored by an earlier flush or another worker are skipped
+                EmailBody.objects.bulk_create(bodies, batch_size=self.flush_size, ignore_conflicts=True)
+                # A sent row whose send key is already taken is a duplicate send
+                # (see EmailLog.send_key); skip it rather than lose the batch
+                EmailLog.objects.bulk_create(rows, batch_size=self.flush_size, ignore_conflicts=True)
+        except Exception:
+            logger.exception(f"Failed to write {len(rows)} email log rows")
+            raise
@@ -1,5 +1,4 @@
 import django_filters
-from django.db.models import Q
 from datetime import date, timedelta
 from .models import Member
 
@@ -79,33 +78,20 @@ class MemberFilter(django_filters.FilterSet):
 
     def filter_birthday_today(self, queryset, name, value):
         if value:
-            today = date.today()
-            return queryset.filter(
-                birthday__month=today.month,
-                birthday__day=today.day
-            )
+            return queryset.filter(Member.birthday_between(date.today()))
         return queryset
 
     def filter_birthday_this_week(self, queryset, name, value):
         if value:
             today = date.today()
-            week_end = today + timedelta(days=7)
-            
-            # Handle year boundary
-            if today.year == week_end.year:
-                return queryset.filter(
-                    Q(birthday__month=today.month, birthday__day__gte=today.day) |
-                    Q(birthday__month=week_end.month, birthday__day__lte=week_end.day)
-                )
-            else:
-                return queryset.filter(
-                    Q(birthday__month=today.month, birthday__day__gte=today.day) |
-                    Q(birthday__month=week_end.month, birthday__day__lte=week_end.day)
-                )
+            # The window may cross new year, birthday_between handles it
+            return queryset.filter(Member.birthday_between(today, today + timedelta(days=7)))
         return queryset
 
     def filter_birthday_this_month(self, queryset, name, value):
         if value:
-            today = date.today()
-            return queryset.filter(birthday__month=today.month)
-        return queryset
\ No newline at end of file
+            # The whole MMDD range of the month, so Feb 29 birthdays are
+            # included in non-leap years too
+            month = date.today().month
+            return queryset.filter(birthday_md__gte=month * 100 + 1, birthday_md__lte=month * 100 + 31)
+        return queryset
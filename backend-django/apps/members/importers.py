@@ -0,0 +1,340 @@
+from datetime import date, datetime, timedelta
+from itertools import islice
+import pandas as pd
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from openpyxl import load_workbook
+from rest_framework.fields import BooleanField
+from .dashboard import bump_dashboard_version
+from .models import ImportJob, Member
+from .stats import invalidate_member_stats
+
+DATE_COLUMNS = ('subscription_due_date', 'birthday', 'last_checkin_date')
+COLUMNS = ('full_name', 'email', 'phone', 'membership_type', 'is_active') + DATE_COLUMNS
+# Fields an upsert can change; email is the key
+UPSERT_FIELDS = ('full_name', 'phone', 'membership_type', 'is_active') + DATE_COLUMNS
+MEMBERSHIP_TYPES = {value for value, _ in Member.MEMBERSHIP_TYPES}
+
+
+def _csv_chunks(file, chunk_size, skip_rows):
+    # Rows already imported are parsed and dropped: skipping by line number
+    # would miscount blank lines and newlines inside quoted fields
+    with pd.read_csv(file, dtype=str, chunksize=chunk_size) as reader:
+        for chunk in reader:
+            if skip_rows >= len(chunk):
+                skip_rows -= len(chunk)
+                continue
+            yield chunk.iloc[skip_rows:]
+            skip_rows = 0
+
+
+def _cell(value):
+    if value is None:
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _xlsx_chunks(file, chunk_size, skip_rows):
+    # read_only streams the sheet XML instead of building every cell
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [_cell(value) for value in next(rows, ())]
+        # Blank rows are dropped before anything is counted, as read_csv
+        # drops blank lines
+        rows = (row for row in rows if any(value not in (None, '') for value in row))
+        rows = islice(rows, skip_rows, None)
+        while True:
+            batch = [[_cell(value) for value in row] for row in islice(rows, chunk_size)]
+            if not batch:
+                break
+            yield pd.DataFrame(batch, columns=header, dtype=object)
+    finally:
+        workbook.close()
+
+
+def _xls_chunks(file, chunk_size, skip_rows):
+    # The legacy format has no streaming reader; it is loaded whole
+    df = pd.read_excel(file, dtype=str)
+    for start in range(skip_rows, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+
+def iter_member_chunks(file, chunk_size, skip_rows=0):
+    """
+    DataFrames of up to `chunk_size` rows of an uploaded CSV or Excel
+    file, read as they are consumed so memory doesn't grow with the file,
+    after skipping the first `skip_rows` data rows. Cells are strings
+    (blank cells NaN/None) so the importer does its own coercion.
+    """
+    name = file.name.lower()
+    if name.endswith('.csv'):
+        return _csv_chunks(file, chunk_size, skip_rows)
+    if name.endswith('.xlsx'):
+        return _xlsx_chunks(file, chunk_size, skip_rows)
+    return _xls_chunks(file, chunk_size, skip_rows)
+
+
+def _parse_dates(column):
+    # The inferred format handles a consistently formatted column in one
+    # pass; only cells it can't read are parsed one by one
+    parsed = pd.to_datetime(column, errors='coerce')
+    retry = parsed.isna() & column.notna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(column[retry], errors='coerce', format='mixed')
+    return parsed
+
+
+def _parse_booleans(column):
+    # Same spellings as the API's BooleanField; blank means active
+    values = column.str.strip().str.lower()
+    parsed = pd.Series(True, index=column.index, dtype=object)
+    parsed[values.isin({str(value).lower() for value in BooleanField.FALSE_VALUES})] = False
+    invalid = values.notna() & ~values.isin(
+        {str(value).lower() for value in BooleanField.TRUE_VALUES | BooleanField.FALSE_VALUES}
+    )
+    return parsed, invalid
+
+
+def _existing_members(emails, fields=()):
+    # One IN query, split only where the database caps query parameters
+    size = connection.features.max_query_params or len(emails) or 1
+    existing = {}
+    for start in range(0, len(emails), size):
+        members = Member.objects.filter(email__in=emails[start:start + size]).order_by().only('email', *fields)
+        existing.update((member.email, member) for member in members)
+    return existing
+
+
+def _is_email(value):
+    try:
+        validate_email(value)
+    except ValidationError:
+        return False
+    return True
+
+
+def _validate(df, upsert=False):
+    """
+    Coerce the columns of `df` in place and return (errors, provided,
+    existing): {index: {field: [errors]}} for the rows that can't be
+    imported, a frame of which cells were filled in, and the stored
+    members with the file's emails by email. Without `upsert` an
+    existing email is an error; with it the row updates that member.
+    """
+    errors = {}
+
+    def flag(mask, field, message):
+        for index in df.index[mask]:
+            errors.setdefault(index, {}).setdefault(field, []).append(message)
+
+    for column in COLUMNS:
+        if column not in df:
+            df[column] = pd.Series(pd.NA, index=df.index, dtype=object)
+    provided = pd.DataFrame({
+        column: df[column].astype('string').str.strip().fillna('') != '' for column in COLUMNS
+    })
+    for column in ('full_name', 'email', 'phone', 'membership_type'):
+        df[column] = df[column].fillna('').astype(str).str.strip()
+
+    blank_email = df['email'] == ''
+    flag(blank_email, 'email', "This field may not be blank.")
+    emails = df['email'][~blank_email]
+    flag(df.index.isin(emails.index[~emails.map(_is_email)]), 'email', "Enter a valid email address.")
+    flag(~blank_email & df['email'].duplicated(), 'email', "Duplicate of an earlier row in this file.")
+
+    existing = _existing_members(emails.unique().tolist(), UPSERT_FIELDS + ('birthday_md',) if upsert else ())
+    if upsert:
+        # Rows for existing members only change the cells they fill in
+        new = ~df['email'].isin(existing)
+    else:
+        flag(df['email'].isin(existing), 'email', "A member with this email already exists.")
+        new = pd.Series(True, index=df.index)
+
+    flag((df['full_name'] == '') & new, 'full_name', "This field may not be blank.")
+    flag(df['full_name'].str.len() > 255, 'full_name', "Ensure this field has no more than 255 characters.")
+    flag(df['phone'].str.len() > 20, 'phone', "Ensure this field has no more than 20 characters.")
+
+    df['membership_type'] = df['membership_type'].replace('', 'basic')
+    invalid_type = ~df['membership_type'].isin(MEMBERSHIP_TYPES)
+    for index in df.index[invalid_type]:
+        errors.setdefault(index, {})['membership_type'] = [
+            f'"{df.at[index, "membership_type"]}" is not a valid choice.'
+        ]
+
+    df['is_active'], invalid_active = _parse_booleans(df['is_active'].astype('string'))
+    flag(invalid_active, 'is_active', "Must be a valid boolean.")
+
+    for column in DATE_COLUMNS:
+        raw = df[column]
+        df[column] = _parse_dates(raw)
+        flag(raw.notna() & df[column].isna(), column, "Date has wrong format.")
+    flag(~provided['subscription_due_date'] & new, 'subscription_due_date', "This field is required.")
+    return errors, provided, existing
+
+
+def _date(value):
+    return value.date() if pd.notna(value) else None
+
+
+def import_members(df, created_by=None, batch_size=None, first_row=1, mode='create'):
+    """
+    Import members from the rows of `df` (see iter_member_chunks()).
+
+    Columns are validated and coerced as a whole and emails are checked
+    against the table in one query and within the file. In 'create' mode
+    a row whose email exists is an error; in 'upsert' mode it updates
+    that member with the cells it fills in that differ from what is
+    stored. New rows go in with bulk_create and changed members with one
+    bulk_update, in one transaction. Rows with errors are skipped and
+    reported as "Row <n>: {field: [errors]}", n counting data rows from
+    `first_row`.
+    """
+    batch_size = batch_size or getattr(settings, 'MEMBER_IMPORT_BATCH_SIZE', 1000)
+    df = df.reset_index(drop=True)
+    errors, provided, existing = _validate(df, upsert=mode == 'upsert')
+
+    valid = ~df.index.isin(errors.keys())
+    new_members = []
+    updated_members = []
+    updated_fields = set()
+    unchanged = 0
+    now = timezone.now()
+    for row, filled in zip(df.loc[valid, list(COLUMNS)].itertuples(), provided[valid].itertuples()):
+        values = {
+            'full_name': row.full_name,
+            'phone': row.phone,
+            'subscription_due_date': _date(row.subscription_due_date),
+            'birthday': _date(row.birthday),
+            'last_checkin_date': _date(row.last_checkin_date),
+            'membership_type': row.membership_type,
+            'is_active': row.is_active,
+        }
+        member = existing.get(row.email)
+        if member is None:
+            new_members.append(Member(
+                email=row.email,
+                # bulk_create skips Member.save(), which normally fills this in
+                birthday_md=Member.month_day(values['birthday']) if values['birthday'] else None,
+                created_by=created_by,
+                **values,
+            ))
+            continue
+
+        changes = {
+            field: value for field, value in values.items()
+            if getattr(filled, field) and getattr(member, field) != value
+        }
+        if not changes:
+            unchanged += 1
+            continue
+        if 'birthday' in changes:
+            changes['birthday_md'] = Member.month_day(changes['birthday'])
+        # bulk_update skips auto_now as well
+        changes['updated_at'] = now
+        for field, value in changes.items():
+            setattr(member, field, value)
+        updated_members.append(member)
+        updated_fields.update(changes)
+
+    with transaction.atomic():
+        Member.objects.bulk_create(new_members, batch_size=batch_size)
+        if updated_members:
+            Member.objects.bulk_update(updated_members, sorted(updated_fields), batch_size=batch_size)
+            member_ids = [member.pk for member in updated_members]
+            transaction.on_commit(lambda: bump_dashboard_version(*member_ids))
+        # No post_save signals for bulk_create/bulk_update
+        transaction.on_commit(invalidate_member_stats)
+
+    return {
+        'created': len(new_members),
+        'updated': len(updated_members),
+        'unchanged': unchanged,
+        'errors': [f"Row {index + first_row}: {errors[index]}" for index in sorted(errors)],
+    }
+
+
+class ImportLeaseLost(Exception):
+    """
+    Raised by run_import_job() when another worker has taken over the job,
+    i.e. this one let its lease expire. The chunk in progress is rolled back.
+    """
+
+
+def _lease():
+    return timezone.now() + timedelta(seconds=getattr(settings, 'MEMBER_IMPORT_LEASE', 600))
+
+
+def claim_import_job(job_id):
+    """
+    Claim an ImportJob for this worker: pending, failed, or running with an
+    expired lease -> running with a fresh lease. False if it is completed
+    or another worker holds it.
+    """
+    claimable = Q(status__in=['pending', 'failed']) | Q(status='running', lease_expires_at__lt=timezone.now())
+    return bool(ImportJob.objects.filter(claimable, pk=job_id).update(
+        status='running', lease_expires_at=_lease(), error_message=''
+    ))
+
+
+def run_import_job(job_id, chunk_size=None):
+    """
+    Import the file of an ImportJob in chunks of MEMBER_IMPORT_CHUNK_SIZE
+    rows, starting after its processed_rows. Returns the job, or None when
+    it couldn't be claimed (see claim_import_job()).
+
+    The file is streamed: each chunk is read, validated and committed
+    before the next is read, so memory is bounded by the chunk size rather
+    than the file. Each chunk's members, the job's counters and a renewed
+    lease commit together, with the job row locked and its checkpoint
+    checked, so running it again after a crash picks up where the last
+    committed chunk left off and a worker that lost its lease stops
+    without importing anything twice. total_rows is only known once the
+    whole file has been read.
+    """
+    chunk_size = chunk_size or getattr(settings, 'MEMBER_IMPORT_CHUNK_SIZE', 5000)
+    max_errors = getattr(settings, 'MEMBER_IMPORT_MAX_ERRORS', 1000)
+    if not claim_import_job(job_id):
+        return None
+    job = ImportJob.objects.get(pk=job_id)
+    if not job.started_at:
+        job.started_at = timezone.now()
+        job.save(update_fields=['started_at'])
+
+    with job.file.open('rb') as file:
+        for chunk in iter_member_chunks(file, chunk_size, skip_rows=job.processed_rows):
+            with transaction.atomic():
+                current = ImportJob.objects.select_for_update().only('processed_rows').get(pk=job.pk)
+                if current.processed_rows != job.processed_rows:
+                    raise ImportLeaseLost(f"Import job {job.pk} was taken over by another worker")
+                result = import_members(
+                    chunk, created_by=job.created_by, first_row=job.processed_rows + 1, mode=job.mode
+                )
+                job.processed_rows += len(chunk)
+                job.created_count += result['created']
+                job.updated_count += result['updated']
+                job.unchanged_count += result['unchanged']
+                job.error_count += len(result['errors'])
+                job.errors.extend(result['errors'][:max(max_errors - len(job.errors), 0)])
+                job.lease_expires_at = _lease()
+                job.save(update_fields=[
+                    'processed_rows', 'created_count', 'updated_count', 'unchanged_count', 'error_count', 'errors',
+                    'lease_expires_at',
+                ])
+
+    with transaction.atomic():
+        current = ImportJob.objects.select_for_update().only('processed_rows').get(pk=job.pk)
+        if current.processed_rows != job.processed_rows:
+            raise ImportLeaseLost(f"Import job {job.pk} was taken over by another worker")
+        job.status = 'completed'
+        job.total_rows = job.processed_rows
+        job.completed_at = timezone.now()
+        job.lease_expires_at = None
+        job.save(update_fields=['status', 'total_rows', 'completed_at', 'lease_expires_at'])
+    return job
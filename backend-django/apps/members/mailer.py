@@ -0,0 +1,163 @@
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from .ratelimit import get_email_rate_limiter
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimited(Exception):
+    """
+    Raised by CampaignMailer.send_batch() when the outbound rate limit (or
+    the ESP answering 429) stops a batch part-way. `errors` holds the
+    results for the messages handled before it, same as send_batch().
+    """
+
+    def __init__(self, errors):
+        super().__init__("Outbound email rate limit reached")
+        self.errors = errors
+
+
+def _is_throttled(error):
+    # Anymail's API errors carry the ESP's HTTP status
+    return getattr(error, 'status_code', None) == 429
+
+
+def default_from_email():
+    return f"{settings.DEFAULT_FROM_NAME} <{settings.DEFAULT_FROM_EMAIL}>"
+
+
+def build_message(subject, text_content, html_content, to_email, connection=None):
+    """
+    Build a multipart (text + HTML) message for a single recipient
+    """
+    message = EmailMultiAlternatives(
+        subject=subject,
+        body=text_content,
+        from_email=default_from_email(),
+        to=[to_email],
+        connection=connection,
+    )
+    message.attach_alternative(html_content, 'text/html')
+    return message
+
+
+class CampaignMailer:
+    """
+    Sends campaign emails over one reusable backend connection.
+
+    The connection (SMTP session or ESP HTTP session) is opened once and
+    reused for every batch, instead of once per message like send_mail().
+    Messages are handed to send_messages() one at a time within a batch so
+    a failure can be pinned on the exact recipient; after `batch_size`
+    messages the session is recycled to stay under per-session limits.
+
+    Every message first takes a token from the shared outbound rate limiter
+    (see ratelimit.py), waiting up to EMAIL_RATE_LIMIT_MAX_WAIT seconds.
+
+    Backends that report per message themselves (send_messages_detailed(),
+    e.g. async_smtp.AsyncSMTPBackend) get the whole batch in one call so
+    they can send it concurrently. The backend defaults to
+    EMAIL_CAMPAIGN_BACKEND, falling back to EMAIL_BACKEND.
+
+    Usage:
+        with CampaignMailer() as mailer:
+            errors = mailer.send_batch(messages)
+    """
+
+    def __init__(self, batch_size=None, connection=None, rate_limiter=None):
+        self.batch_size = batch_size or getattr(settings, 'EMAIL_SEND_BATCH_SIZE', 100)
+        self.connection = connection or get_connection(
+            getattr(settings, 'EMAIL_CAMPAIGN_BACKEND', None) or None, fail_silently=False
+        )
+        # rate_limiter=False sends without one (e.g. dry runs)
+        self.rate_limiter = get_email_rate_limiter() if rate_limiter is None else rate_limiter
+        self.max_wait = getattr(settings, 'EMAIL_RATE_LIMIT_MAX_WAIT', 10)
+        self._sent_in_session = 0
+
+    def __enter__(self):
+        self.connection.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def close(self):
+        try:
+            self.connection.close()
+        except Exception as e:
+            logger.warning(f"Error closing mail connection: {str(e)}")
+
+    def _reconnect(self):
+        self.close()
+        self._sent_in_session = 0
+        try:
+            self.connection.open()
+        except Exception as e:
+            # send_messages() will try to open it again and report the
+            # failure against the next message
+            logger.warning(f"Could not reopen mail connection: {str(e)}")
+
+    def send_batch(self, messages):
+        """
+        Send `messages` over the shared connection.
+
+        Returns a list aligned with `messages` holding None for each message
+        that was accepted by the backend, or the exception that made it fail.
+        Raises RateLimited if the remaining messages have to wait.
+        """
+        if hasattr(self.connection, 'send_messages_detailed'):
+            return self._send_concurrently(messages)
+
+        errors = []
+        for message in messages:
+            if self.rate_limiter and not self.rate_limiter.acquire(max_wait=self.max_wait):
+                raise RateLimited(errors)
+
+            if self._sent_in_session >= self.batch_size:
+                self._reconnect()
+
+            message.connection = self.connection
+            try:
+                if not self.connection.send_messages([message]):
+                    raise RuntimeError("Message was not accepted by the email backend")
+                errors.append(None)
+            except Exception as e:
+                if _is_throttled(e):
+                    raise RateLimited(errors)
+                errors.append(e)
+                # The session may be unusable after a failure (dropped socket,
+                # auth timeout...), so start the next message on a fresh one.
+                self._reconnect()
+            else:
+                self._sent_in_session += 1
+        return errors
+
+    def _send_concurrently(self, messages):
+        # Take the rate limit tokens up front; if they run out, send what
+        # was granted and report the rest as deferred
+        granted = len(messages)
+        if self.rate_limiter:
+            for index in range(len(messages)):
+                if not self.rate_limiter.acquire(max_wait=self.max_wait):
+                    granted = index
+                    break
+
+        if self._sent_in_session >= self.batch_size:
+            self._reconnect()
+
+        for message in messages[:granted]:
+            message.connection = self.connection
+        try:
+            errors = self.connection.send_messages_detailed(messages[:granted])
+        except Exception as e:
+            # The whole batch failed, e.g. the server was unreachable
+            errors = [e] * granted
+            self._reconnect()
+        else:
+            self._sent_in_session += granted
+
+        if granted < len(messages):
+            raise RateLimited(errors)
+        return errors
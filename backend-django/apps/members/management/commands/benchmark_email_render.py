@@ -0,0 +1,67 @@
+import time
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from apps.members.models import Member
+from apps.members.rendering import EMAIL_TEMPLATES, frontend_url, member_context, render_email
+
+
+class Command(BaseCommand):
+    help = "Compare render_to_string() against the precompiled email renderer on synthetic members"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--members', type=int, default=100000, help='Synthetic members to render for')
+        parser.add_argument('--template', choices=EMAIL_TEMPLATES, action='append',
+                            help='Template to benchmark (repeatable, defaults to all)')
+
+    def _synthetic_members(self, count):
+        today = date.today()
+        return [
+            Member(
+                full_name=f"member number {i}",
+                email=f"member{i}@example.com",
+                subscription_due_date=today + timedelta(days=i % 6),
+                birthday=today.replace(year=1980 + (i % 10) * 4),  # leap years, so Feb 29 works
+                last_checkin_date=today - timedelta(days=8 + i % 20),
+                milestones=[f"Milestone {i % 5}"] if i % 2 else [],
+            )
+            for i in range(count)
+        ]
+
+    def _extra_context(self, member):
+        # Per-template values the campaign builders add on top of `member`
+        return {
+            'days_until_due': member.days_until_due,
+            'days_since_checkin': member.days_since_checkin,
+            'age': date.today().year - member.birthday.year,
+        }
+
+    def _render_legacy(self, template_name, member):
+        context = dict(self._extra_context(member), member=member, frontend_url=frontend_url())
+        return (
+            render_to_string(f'emails/{template_name}.txt', context),
+            render_to_string(f'emails/{template_name}.html', context),
+        )
+
+    def _render_compiled(self, template_name, member):
+        context = dict(self._extra_context(member), member=member_context(member))
+        return render_email(template_name, context)
+
+    def _run(self, render, template_name, members):
+        started = time.perf_counter()
+        for member in members:
+            render(template_name, member)
+        return time.perf_counter() - started
+
+    def handle(self, *args, **options):
+        members = self._synthetic_members(options['members'])
+        for template_name in options['template'] or EMAIL_TEMPLATES:
+            if self._render_legacy(template_name, members[0]) != self._render_compiled(template_name, members[0]):
+                self.stderr.write(self.style.WARNING(f"{template_name}: compiled output differs from render_to_string"))
+
+            legacy = self._run(self._render_legacy, template_name, members)
+            compiled = self._run(self._render_compiled, template_name, members)
+            self.stdout.write(
+                f"{template_name:<22} render_to_string {len(members) / legacy:>9.0f} renders/s   "
+                f"compiled {len(members) / compiled:>9.0f} renders/s   ({legacy / compiled:.1f}x)"
+            )
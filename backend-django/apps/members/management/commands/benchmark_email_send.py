@@ -0,0 +1,124 @@
+import asyncio
+import time
+from django.core.mail import get_connection, send_mail
+from django.core.management.base import BaseCommand, CommandError
+from apps.members.async_smtp import AsyncSMTPBackend
+from apps.members.mailer import CampaignMailer, build_message, default_from_email
+
+
+class _DiscardingHandler:
+    def __init__(self, latency=0):
+        self.latency = latency
+
+    async def handle_DATA(self, server, session, envelope):
+        # Stand in for a remote server's processing and round trip time
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return '250 Message accepted for delivery'
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare per-message send_mail() against the pooled CampaignMailer, over "
+        "the SMTP backend and the concurrent AsyncSMTPBackend, against a local SMTP "
+        "sink, e.g. `python -m aiosmtpd -n -l localhost:1025` (or pass --start-sink)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=1000, help='Messages to send per run')
+        parser.add_argument('--host', default='localhost', help='SMTP sink host')
+        parser.add_argument('--port', type=int, default=1025, help='SMTP sink port')
+        parser.add_argument('--batch-size', type=int, default=None, help='Messages per connection (defaults to EMAIL_SEND_BATCH_SIZE)')
+        parser.add_argument('--pool-size', type=int, default=None,
+                            help='Concurrent sessions of the async backend (defaults to EMAIL_ASYNC_SMTP_POOL_SIZE)')
+        parser.add_argument('--start-sink', action='store_true',
+                            help='Run an aiosmtpd sink that discards messages on --host/--port for the benchmark')
+        parser.add_argument('--sink-latency', type=float, default=0,
+                            help='Milliseconds the --start-sink sink takes to accept each message')
+
+    def _connection(self, options):
+        return get_connection(
+            'django.core.mail.backends.smtp.EmailBackend',
+            host=options['host'],
+            port=options['port'],
+            username='',
+            password='',
+            use_tls=False,
+            use_ssl=False,
+            fail_silently=False,
+        )
+
+    def _async_connection(self, options):
+        return AsyncSMTPBackend(
+            host=options['host'],
+            port=options['port'],
+            username='',
+            password='',
+            use_tls=False,
+            use_ssl=False,
+            pool_size=options['pool_size'],
+        )
+
+    def _start_sink(self, options):
+        try:
+            from aiosmtpd.controller import Controller
+        except ImportError:
+            raise CommandError("--start-sink requires aiosmtpd: pip install aiosmtpd")
+        handler = _DiscardingHandler(latency=options['sink_latency'] / 1000)
+        sink = Controller(handler, hostname=options['host'], port=options['port'])
+        sink.start()
+        return sink
+
+    def _run_mailer(self, label, connection, options):
+        count = options['messages']
+        started = time.perf_counter()
+        with CampaignMailer(batch_size=options['batch_size'], connection=connection, rate_limiter=False) as mailer:
+            messages = [
+                build_message(f"Benchmark {i}", 'Benchmark message', '<p>Benchmark message</p>', f"member{i}@example.com")
+                for i in range(count)
+            ]
+            failed = 0
+            for start in range(0, count, mailer.batch_size):
+                errors = mailer.send_batch(messages[start:start + mailer.batch_size])
+                failed += sum(1 for error in errors if error is not None)
+        self._report(label, count, failed, time.perf_counter() - started)
+
+    def _report(self, label, count, failed, elapsed):
+        rate = count / elapsed if elapsed else 0
+        self.stdout.write(f"{label:<22} {count} messages, {failed} failed in {elapsed:.2f}s ({rate:.1f} msg/s)")
+
+    def handle(self, *args, **options):
+        sink = self._start_sink(options) if options['start_sink'] else None
+        try:
+            self._benchmark(options)
+        finally:
+            if sink:
+                sink.stop()
+
+    def _benchmark(self, options):
+        count = options['messages']
+        html = '<p>Benchmark message</p>'
+        text = 'Benchmark message'
+
+        # Current path: send_mail() opens a new connection for every message
+        failed = 0
+        started = time.perf_counter()
+        for i in range(count):
+            try:
+                send_mail(
+                    subject=f"Benchmark {i}",
+                    message=text,
+                    from_email=default_from_email(),
+                    recipient_list=[f"member{i}@example.com"],
+                    html_message=html,
+                    connection=self._connection(options),
+                )
+            except Exception:
+                failed += 1
+        self._report('send_mail per message', count, failed, time.perf_counter() - started)
+
+        # Pooled path: one connection, messages pushed in batches
+        self._run_mailer('CampaignMailer', self._connection(options), options)
+
+        # Concurrent path: batches spread over a pool of async SMTP sessions
+        self._run_mailer('CampaignMailer (async)', self._async_connection(options), options)
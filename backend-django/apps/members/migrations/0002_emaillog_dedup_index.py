@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='emaillog',
+            name='members_ema_member__71d128_idx',
+        ),
+        migrations.AddIndex(
+            model_name='emaillog',
+            index=models.Index(fields=['member', 'email_type', 'status', 'sent_date'], name='members_ema_member__882cf9_idx'),
+        ),
+    ]
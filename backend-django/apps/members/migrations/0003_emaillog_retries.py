@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0002_emaillog_dedup_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='emaillog',
+            name='members_ema_status_901db0_idx',
+        ),
+        migrations.AddField(
+            model_name='emaillog',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='emaillog',
+            name='next_retry_at',
+            field=models.DateTimeField(blank=True, help_text='When a failed send is due to be retried', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='emaillog',
+            index=models.Index(fields=['status', 'next_retry_at'], name='members_ema_status_fc10f0_idx'),
+        ),
+    ]
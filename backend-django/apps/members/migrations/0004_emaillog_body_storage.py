@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0003_emaillog_retries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailTemplateSnapshot',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255)),
+                ('source', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='emaillog',
+            name='email_content',
+            field=models.TextField(blank=True, help_text='Rendered body of emails logged before EmailBody storage'),
+        ),
+        migrations.CreateModel(
+            name='EmailBody',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('data', models.BinaryField()),
+                ('size', models.PositiveIntegerField(help_text='Uncompressed size in bytes')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='bodies', to='members.emailtemplatesnapshot')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='emaillog',
+            name='body',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='logs', to='members.emailbody'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0004_emaillog_body_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emaillog',
+            name='send_key',
+            field=models.CharField(blank=True, help_text='Campaign, member and period of the send; empty for forced sends', max_length=100, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='emaillog',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'sent')), fields=('send_key',), name='unique_sent_email_key'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:33
+
+from django.db import migrations, models
+from django.db.models.functions import ExtractDay, ExtractMonth
+
+
+def backfill_birthday_md(apps, schema_editor):
+    Member = apps.get_model('members', 'Member')
+    Member.objects.filter(birthday__isnull=False).update(
+        birthday_md=ExtractMonth('birthday') * 100 + ExtractDay('birthday')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0005_emaillog_send_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='birthday_md',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, help_text='Birthday as MMDD, kept in sync with birthday for indexed month/day lookups', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='member',
+            index=models.Index(fields=['birthday_md'], name='members_mem_birthda_071119_idx'),
+        ),
+        migrations.RunPython(backfill_birthday_md, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0006_member_birthday_md'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyStatsSnapshot',
+            fields=[
+                ('date', models.DateField(primary_key=True, serialize=False)),
+                ('total_members', models.PositiveIntegerField()),
+                ('active_members', models.PositiveIntegerField()),
+                ('inactive_members', models.PositiveIntegerField()),
+                ('due_soon', models.PositiveIntegerField()),
+                ('overdue', models.PositiveIntegerField()),
+                ('new_members', models.PositiveIntegerField(help_text='Members created that day')),
+                ('membership_types', models.JSONField(default=dict, help_text='Member count per membership type')),
+                ('checkins', models.PositiveIntegerField(help_text='Check-ins that day')),
+                ('members_checked_in', models.PositiveIntegerField(help_text='Distinct members who checked in that day')),
+                ('created_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='membercheckin',
+            index=models.Index(fields=['checkin_time'], name='members_mem_checkin_9bb59d_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:44
+
+from datetime import timedelta
+from itertools import groupby
+
+from django.db import migrations, models
+
+
+def backfill_streaks(apps, schema_editor):
+    Member = apps.get_model('members', 'Member')
+    WorkoutLog = apps.get_model('members', 'WorkoutLog')
+    rows = (
+        WorkoutLog.objects.filter(completed=True)
+        .order_by('member_id', 'date').values_list('member_id', 'date').distinct()
+    )
+    for member_id, member_rows in groupby(rows.iterator(), key=lambda row: row[0]):
+        current = longest = 0
+        previous = None
+        for _, day in member_rows:
+            current = current + 1 if previous and day - previous == timedelta(days=1) else 1
+            longest = max(longest, current)
+            previous = day
+        Member.objects.filter(pk=member_id).update(
+            current_streak=current, longest_streak=longest, last_workout_date=previous
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0007_daily_stats_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='current_streak',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Consecutive days with a completed workout, up to last_workout_date'),
+        ),
+        migrations.AddField(
+            model_name='member',
+            name='last_workout_date',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='member',
+            name='longest_streak',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_streaks, migrations.RunPython.noop),
+    ]
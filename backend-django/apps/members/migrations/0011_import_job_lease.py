@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0010_import_job_upsert'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='lease_expires_at',
+            field=models.DateTimeField(blank=True, help_text='While running, until when the claiming worker holds the job; renewed every chunk', null=True),
+        ),
+    ]
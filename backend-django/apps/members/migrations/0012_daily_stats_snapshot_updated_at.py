@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 06:12
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0011_import_job_lease'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='dailystatssnapshot',
+            old_name='created_at',
+            new_name='updated_at',
+        ),
+    ]
@@ -1,5 +1,7 @@
 import uuid
+import zlib
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 
@@ -25,12 +27,22 @@ class Member(models.Model):
     phone = models.CharField(max_length=20, blank=True)
     subscription_due_date = models.DateField()
     birthday = models.DateField(null=True, blank=True)
+    birthday_md = models.PositiveSmallIntegerField(
+        null=True, blank=True, editable=False,
+        help_text="Birthday as MMDD, kept in sync with birthday for indexed month/day lookups"
+    )
     last_checkin_date = models.DateField(null=True, blank=True)
     emergency_contact = models.TextField(blank=True)
     address = models.TextField(blank=True)
     membership_type = models.CharField(max_length=50, choices=MEMBERSHIP_TYPES, default='basic')
     notes = models.TextField(blank=True)
     milestones = models.JSONField(default=list, blank=True)
+    current_streak = models.PositiveIntegerField(
+        default=0, editable=False,
+        help_text="Consecutive days with a completed workout, up to last_workout_date"
+    )
+    longest_streak = models.PositiveIntegerField(default=0, editable=False)
+    last_workout_date = models.DateField(null=True, blank=True, editable=False)
     is_active = models.BooleanField(default=True)
     gender = models.CharField(max_length=1, choices=GENDER_CHOICES, blank=True)
     height = models.FloatField(null=True, blank=True, help_text="Height in cm")
@@ -48,11 +60,53 @@ class Member(models.Model):
             models.Index(fields=['subscription_due_date']),
             models.Index(fields=['is_active']),
             models.Index(fields=['birthday']),
+            models.Index(fields=['birthday_md']),
         ]
 
     def __str__(self):
         return f"{self.full_name} ({self.email})"
 
+    # Maintained by the WorkoutLog signals with queryset updates (streaks.py)
+    STREAK_FIELDS = ('current_streak', 'longest_streak', 'last_workout_date')
+
+    def save(self, *args, **kwargs):
+        self.birthday_md = self.month_day(self.birthday) if self.birthday else None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'birthday' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'birthday_md'}
+        elif update_fields is None and not self._state.adding and not kwargs.get('force_insert'):
+            # Leave the streak fields out of full saves, which would write
+            # back the values from when this instance was loaded
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in deferred
+                and field.name not in self.STREAK_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def month_day(value):
+        """
+        MMDD of a date, the value stored in birthday_md
+        """
+        return value.month * 100 + value.day
+
+    @classmethod
+    def birthday_between(cls, start, end=None):
+        """
+        Q for members whose birthday (ignoring the year) falls between
+        `start` and `end` inclusive, as a range on the birthday_md index.
+        A window crossing new year becomes two ranges.
+        """
+        start_md = cls.month_day(start)
+        end_md = cls.month_day(end or start)
+        if start_md == end_md:
+            return Q(birthday_md=start_md)
+        if start_md < end_md:
+            return Q(birthday_md__gte=start_md, birthday_md__lte=end_md)
+        return Q(birthday_md__gte=start_md) | Q(birthday_md__lte=end_md)
+
     @property
     def days_until_due(self):
         from datetime import date
@@ -77,6 +131,17 @@ class Member(models.Model):
     def is_inactive(self):
         return self.days_since_checkin and self.days_since_checkin > 7
 
+    @property
+    def workout_streak(self):
+        """
+        Consecutive days with a completed workout ending today, from the
+        streak fields the WorkoutLog signals maintain
+        """
+        from datetime import date
+        if self.last_workout_date != date.today():
+            return 0
+        return self.current_streak
+
     @property
     def is_birthday_today(self):
         if not self.birthday:
@@ -279,6 +344,44 @@ class TrainingSession(models.Model):
         return self.current_participants >= self.max_participants
 
 
+class EmailTemplateSnapshot(models.Model):
+    """
+    The source of an email template as it was when emails were rendered
+    from it, stored once per version and addressed by its SHA-256.
+    """
+    digest = models.CharField(max_length=64, primary_key=True)
+    name = models.CharField(max_length=255)
+    source = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.name} ({self.digest[:12]})"
+
+
+class EmailBody(models.Model):
+    """
+    A rendered email body, stored once per distinct content (addressed by
+    its SHA-256) and zlib-compressed with the template source as preset
+    dictionary, so only what differs from the template takes up space.
+    """
+    digest = models.CharField(max_length=64, primary_key=True)
+    snapshot = models.ForeignKey(EmailTemplateSnapshot, on_delete=models.PROTECT, related_name='bodies')
+    data = models.BinaryField()
+    size = models.PositiveIntegerField(help_text="Uncompressed size in bytes")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.digest
+
+    @property
+    def content(self):
+        decompressor = zlib.decompressobj(zdict=self.snapshot.source.encode('utf-8'))
+        return (decompressor.decompress(bytes(self.data)) + decompressor.flush()).decode('utf-8')
+
+
 class EmailLog(models.Model):
     EMAIL_TYPES = [
         ('subscription', 'Subscription Reminder'),
@@ -302,19 +405,39 @@ class EmailLog(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     error_message = models.TextField(blank=True)
     email_subject = models.CharField(max_length=255, blank=True)
-    email_content = models.TextField(blank=True)
+    email_content = models.TextField(blank=True, help_text="Rendered body of emails logged before EmailBody storage")
+    body = models.ForeignKey(EmailBody, on_delete=models.PROTECT, null=True, blank=True, related_name='logs')
+    attempts = models.PositiveSmallIntegerField(default=1)
+    next_retry_at = models.DateTimeField(null=True, blank=True, help_text="When a failed send is due to be retried")
+    send_key = models.CharField(
+        max_length=100, null=True, blank=True,
+        help_text="Campaign, member and period of the send; empty for forced sends"
+    )
 
     class Meta:
         ordering = ['-sent_date']
         indexes = [
-            models.Index(fields=['member', 'email_type']),
+            # Covers the "already sent" dedup lookup in tasks.py
+            models.Index(fields=['member', 'email_type', 'status', 'sent_date']),
             models.Index(fields=['sent_date']),
-            models.Index(fields=['status']),
+            models.Index(fields=['status', 'next_retry_at']),
+        ]
+        constraints = [
+            # At most one sent email per campaign, member and period
+            models.UniqueConstraint(
+                fields=['send_key'], condition=models.Q(status='sent'), name='unique_sent_email_key'
+            ),
         ]
 
     def __str__(self):
         return f"{self.email_type} to {self.member.full_name} - {self.status}"
 
+    @property
+    def content(self):
+        if self.body_id:
+            return self.body.content
+        return self.email_content
+
 
 class MemberCheckin(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -326,6 +449,9 @@ class MemberCheckin(models.Model):
 
     class Meta:
         ordering = ['-checkin_time']
+        indexes = [
+            models.Index(fields=['checkin_time']),
+        ]
 
     def __str__(self):
         return f"{self.member.full_name} - {self.checkin_time.date()}"
@@ -334,4 +460,76 @@ class MemberCheckin(models.Model):
         if self.checkout_time and self.checkin_time:
             duration = self.checkout_time - self.checkin_time
             self.duration_minutes = int(duration.total_seconds() / 60)
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+
+class DailyStatsSnapshot(models.Model):
+    """
+    Member stats as they stood at the end of a day, written nightly by
+    tasks.snapshot_daily_stats so trends can be read without rescanning
+    the member table.
+    """
+    date = models.DateField(primary_key=True)
+    total_members = models.PositiveIntegerField()
+    active_members = models.PositiveIntegerField()
+    inactive_members = models.PositiveIntegerField()
+    due_soon = models.PositiveIntegerField()
+    overdue = models.PositiveIntegerField()
+    new_members = models.PositiveIntegerField(help_text="Members created that day")
+    membership_types = models.JSONField(default=dict, help_text="Member count per membership type")
+    checkins = models.PositiveIntegerField(help_text="Check-ins that day")
+    members_checked_in = models.PositiveIntegerField(help_text="Distinct members who checked in that day")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-date']
+
+    def __str__(self):
+        return f"Stats for {self.date}"
+
+
+class ImportJob(models.Model):
+    """
+    A bulk member upload, stored on disk and imported in the background by
+    tasks.process_import_job. processed_rows is the checkpoint: each chunk
+    of rows commits together with it, so an interrupted job resumes after
+    the last committed chunk. A worker claims the job with a lease before
+    importing, so only one worker imports it at a time.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    MODE_CHOICES = [
+        ('create', 'Create new members only'),
+        ('upsert', 'Create new members and update existing ones by email'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    file = models.FileField(upload_to='imports/%Y/%m/')
+    mode = models.CharField(max_length=10, choices=MODE_CHOICES, default='create')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    unchanged_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True, help_text="Row errors, up to MEMBER_IMPORT_MAX_ERRORS")
+    error_message = models.TextField(blank=True, help_text="Why the job failed, if it did")
+    lease_expires_at = models.DateTimeField(
+        null=True, blank=True,
+        help_text="While running, until when the claiming worker holds the job; renewed every chunk"
+    )
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Import {self.id} ({self.status})"
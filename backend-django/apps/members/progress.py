@@ -0,0 +1,94 @@
+import time
+from django.conf import settings
+import redis
+import logging
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = ('selected', 'chunks', 'chunks_done', 'sent', 'failed', 'skipped')
+
+
+class CampaignProgress:
+    """
+    Live counters of one campaign run, in a Redis hash keyed by the id of
+    the task that started it (the task_id SendEmailView returns).
+
+    The fan-out records what was selected, chunk tasks add their counts as
+    they go and the chord callback marks the run completed, so reading it
+    is a single HGETALL, independent of the campaign's size.
+    """
+
+    def __init__(self, client, task_id, ttl=None):
+        self.client = client
+        self.task_id = task_id
+        self.key = f'campaign-progress:{task_id}'
+        self.ttl = ttl or getattr(settings, 'EMAIL_PROGRESS_TTL', 86400)
+
+    def _write(self, fields=None, increments=None):
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for name, amount in (increments or {}).items():
+                if amount:
+                    pipe.hincrby(self.key, name, amount)
+            pipe.hset(self.key, mapping=dict(fields or {}, updated_at=time.time()))
+            pipe.expire(self.key, self.ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            # Progress is informational; never let it fail a send
+            logger.warning(f"Could not update progress of campaign {self.task_id}: {str(e)}")
+
+    def start(self, email_type, selected, chunks):
+        now = time.time()
+        self._write(fields={
+            'email_type': email_type, 'status': 'running', 'started_at': now,
+            'selected': selected, 'chunks': chunks, 'chunks_done': 0,
+            'sent': 0, 'failed': 0, 'skipped': 0,
+        })
+
+    def add(self, sent=0, failed=0, skipped=0):
+        self._write(increments={'sent': sent, 'failed': failed, 'skipped': skipped})
+
+    def chunk_done(self):
+        self._write(increments={'chunks_done': 1})
+
+    def finish(self):
+        self._write(fields={'status': 'completed'})
+
+    def read(self):
+        """
+        The counters as a dict with the send rate (messages/second) and
+        the estimated seconds remaining, or None for an unknown task.
+        """
+        data = {key.decode(): value.decode() for key, value in self.client.hgetall(self.key).items()}
+        if 'started_at' not in data:
+            # Unknown, or expired and recreated by a late add() with only
+            # the counters
+            return None
+
+        progress = {'task_id': self.task_id, 'email_type': data['email_type'], 'status': data['status']}
+        progress.update({name: int(data.get(name, 0)) for name in COUNTERS})
+        elapsed = float(data['updated_at']) - float(data['started_at'])
+        handled = progress['sent'] + progress['failed']
+        progress['elapsed_seconds'] = round(elapsed, 1)
+        progress['rate'] = round(handled / elapsed, 2) if elapsed > 0 else 0
+        remaining = progress['selected'] - handled - progress['skipped']
+        progress['eta_seconds'] = (
+            round(remaining / progress['rate']) if progress['rate'] and progress['status'] == 'running' else None
+        )
+        return progress
+
+
+_client = None
+
+
+def campaign_progress(task_id):
+    """
+    CampaignProgress for `task_id`, or None when there is no task id
+    (e.g. a campaign sent directly rather than through a task).
+    """
+    global _client
+    if not task_id:
+        return None
+    if _client is None:
+        _client = redis.from_url(getattr(settings, 'EMAIL_PROGRESS_REDIS_URL', settings.CELERY_BROKER_URL))
+    return CampaignProgress(_client, task_id)
@@ -0,0 +1,99 @@
+import time
+from django.conf import settings
+import redis
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Refill the bucket for the time elapsed since the last call, then take
+# `requested` tokens if there are enough. Returns 0 when the tokens were
+# taken, otherwise the seconds to wait before enough will be available.
+# Uses the Redis clock so every worker sees the same time.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 60)
+return tostring(wait)
+"""
+
+
+class TokenBucket:
+    """
+    Token bucket shared by every worker through Redis: `rate` tokens per
+    second, holding at most `burst`.
+    """
+
+    def __init__(self, client, key, rate, burst):
+        self.client = client
+        self.key = key
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def try_acquire(self, tokens=1):
+        """
+        Take `tokens` if available. Returns 0 on success, otherwise the
+        number of seconds until they should be.
+        """
+        try:
+            return float(self._script(keys=[self.key], args=[self.rate, self.burst, tokens]))
+        except redis.RedisError as e:
+            # Fail open: a Redis outage shouldn't stop emails going out
+            logger.warning(f"Rate limiter unavailable, sending without it: {str(e)}")
+            return 0
+
+    def acquire(self, tokens=1, max_wait=None):
+        """
+        Block until `tokens` are taken from the bucket. Returns False if that
+        would take longer than `max_wait` seconds.
+        """
+        deadline = None if max_wait is None else time.monotonic() + max_wait
+        while True:
+            wait = self.try_acquire(tokens)
+            if not wait:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+_email_rate_limiter = None
+
+
+def get_email_rate_limiter():
+    """
+    The bucket shared by all outbound email, or None when EMAIL_RATE_LIMIT
+    is not set.
+    """
+    global _email_rate_limiter
+    rate = getattr(settings, 'EMAIL_RATE_LIMIT', 0)
+    if not rate:
+        return None
+
+    if _email_rate_limiter is None:
+        client = redis.from_url(getattr(settings, 'EMAIL_RATE_LIMIT_REDIS_URL', settings.CELERY_BROKER_URL))
+        _email_rate_limiter = TokenBucket(
+            client,
+            'ratelimit:outbound-email',
+            rate=rate,
+            burst=getattr(settings, 'EMAIL_RATE_BURST', None) or rate,
+        )
+    return _email_rate_limiter
@@ -0,0 +1,117 @@
+from functools import lru_cache
+from django.conf import settings
+from django.template import Context, Template, engines
+from django.template.base import NodeList, TextNode, VariableNode
+from django.template.defaulttags import IfNode
+
+
+EMAIL_TEMPLATES = [
+    'subscription_reminder',
+    'motivational_email',
+    'birthday_wish',
+    'inactivity_alert',
+]
+
+
+def frontend_url():
+    return settings.FRONTEND_URL if hasattr(settings, 'FRONTEND_URL') else 'http://localhost:5173'
+
+
+def static_context():
+    """
+    Context values that are the same for every recipient (and every render
+    in this worker), so they can be baked into the compiled templates.
+    """
+    return {
+        'frontend_url': frontend_url(),
+    }
+
+
+def member_context(member):
+    """
+    The member fields the email templates actually use, as a plain dict so
+    variable lookups skip the model attribute machinery.
+    """
+    return {
+        'full_name': member.full_name,
+        'email': member.email,
+        'subscription_due_date': member.subscription_due_date,
+        'milestones': member.milestones,
+    }
+
+
+def _is_static(node, static_keys):
+    if not isinstance(node, VariableNode):
+        return False
+    var = node.filter_expression.var
+    lookups = getattr(var, 'lookups', None)
+    return bool(lookups) and lookups[0] in static_keys
+
+
+def _freeze_static_nodes(nodelist, context, static_keys):
+    """
+    Pre-render every {{ variable }} that only depends on the static context
+    and merge runs of plain text into single TextNodes, recursing into
+    {% if %} / {% for %} bodies. What's left to do per recipient is the
+    genuinely per-member output.
+    """
+    frozen = []
+    for node in nodelist:
+        if _is_static(node, static_keys):
+            node = TextNode(node.render(context))
+        elif isinstance(node, IfNode):
+            for _, child_nodelist in node.conditions_nodelists:
+                _freeze_static_nodes(child_nodelist, context, static_keys)
+        else:
+            for attr in node.child_nodelists:
+                child_nodelist = getattr(node, attr, None)
+                if isinstance(child_nodelist, NodeList):
+                    _freeze_static_nodes(child_nodelist, context, static_keys)
+
+        if isinstance(node, TextNode) and frozen and isinstance(frozen[-1], TextNode):
+            frozen[-1] = TextNode(frozen[-1].s + node.s)
+        else:
+            frozen.append(node)
+    nodelist[:] = frozen
+
+
+class CompiledEmailTemplate:
+    """
+    An email template compiled once per worker, with its static fragments
+    already rendered in.
+    """
+
+    def __init__(self, name):
+        engine = engines['django'].engine
+        loaded = engine.get_template(name)
+        # Compile a private copy: the loader's cached Template is shared with
+        # render_to_string() and must not be modified.
+        self.template = Template(loaded.source, origin=loaded.origin, name=name, engine=engine)
+        self.static_context = static_context()
+        self.autoescape = engine.autoescape
+        _freeze_static_nodes(
+            self.template.nodelist,
+            Context(self.static_context, autoescape=self.autoescape),
+            set(self.static_context),
+        )
+
+    def render(self, context):
+        return self.template.render(Context(
+            dict(self.static_context, **context),
+            autoescape=self.autoescape,
+        ))
+
+
+@lru_cache(maxsize=None)
+def get_email_template(name):
+    return CompiledEmailTemplate(name)
+
+
+def render_email(template_name, context):
+    """
+    Render the text and HTML variants of `emails/<template_name>` from a
+    minimal per-recipient context. Returns (text_content, html_content).
+    """
+    text_content = get_email_template(f'emails/{template_name}.txt').render(context)
+    html_content = get_email_template(f'emails/{template_name}.html').render(context)
+    return text_content, html_content
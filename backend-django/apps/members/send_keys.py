@@ -0,0 +1,63 @@
+from django.conf import settings
+import redis
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SendKeyReservations:
+    """
+    Short-lived Redis reservations on campaign send keys (see
+    Campaign.send_key), taken with SET NX before a message goes out so two
+    overlapping runs can't both email the same member in the same period.
+
+    A reservation is kept after a successful send and released after a
+    failed one, so the retry can take it again.
+    """
+
+    def __init__(self, client, prefix='email-send'):
+        self.client = client
+        self.prefix = prefix
+
+    def _name(self, key):
+        return f'{self.prefix}:{key}'
+
+    def reserve(self, keys, ttl):
+        """
+        Try to reserve every key in `keys` for `ttl` seconds, in one round
+        trip. Returns the set of keys this caller now holds.
+        """
+        keys = list(keys)
+        if not keys:
+            return set()
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key in keys:
+                pipe.set(self._name(key), 1, nx=True, ex=ttl)
+            results = pipe.execute()
+        except redis.RedisError as e:
+            # Fail open like the rate limiter; the unique constraint on sent
+            # EmailLog rows still catches what gets through
+            logger.warning(f"Send key reservations unavailable, sending without them: {str(e)}")
+            return set(keys)
+        return {key for key, reserved in zip(keys, results) if reserved}
+
+    def release(self, keys):
+        keys = list(keys)
+        if not keys:
+            return
+        try:
+            self.client.delete(*[self._name(key) for key in keys])
+        except redis.RedisError as e:
+            logger.warning(f"Failed to release {len(keys)} send key reservations: {str(e)}")
+
+
+_send_key_reservations = None
+
+
+def get_send_key_reservations():
+    global _send_key_reservations
+    if _send_key_reservations is None:
+        client = redis.from_url(getattr(settings, 'EMAIL_SEND_KEY_REDIS_URL', settings.CELERY_BROKER_URL))
+        _send_key_reservations = SendKeyReservations(client)
+    return _send_key_reservations
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
 from django.contrib.auth.models import User
 from .models import (
     Member, Coach, WorkoutPlan, WorkoutSession, MemberWorkoutPlan,
-    WorkoutLog, CoachSchedule, TrainingSession, EmailLog, MemberCheckin
+    WorkoutLog, CoachSchedule, TrainingSession, EmailLog, MemberCheckin, DailyStatsSnapshot, ImportJob
 )
 
 
@@ -33,12 +34,28 @@ class MemberSerializer(serializers.ModelSerializer):
             'is_overdue', 'days_since_checkin', 'is_inactive', 'is_birthday_today'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        extra_kwargs = {
+            # Replaces the model's default unique validator, so the email is
+            # checked with a single query
+            'email': {'validators': [UniqueValidator(
+                queryset=Member.objects.all(),
+                message="A member with this email already exists."
+            )]},
+        }
+
+
+# Free-text member fields only the detail view shows
+MEMBER_DETAIL_ONLY_FIELDS = ('emergency_contact', 'address', 'notes', 'fitness_goals', 'medical_conditions')
 
-    def validate_email(self, value):
-        instance = getattr(self, 'instance', None)
-        if Member.objects.exclude(pk=instance.pk if instance else None).filter(email=value).exists():
-            raise serializers.ValidationError("A member with this email already exists.")
-        return value
+
+class MemberListSerializer(MemberSerializer):
+    """
+    Member list rows, without MEMBER_DETAIL_ONLY_FIELDS. MemberViewSet
+    defers those columns when listing.
+    """
+
+    class Meta(MemberSerializer.Meta):
+        fields = [field for field in MemberSerializer.Meta.fields if field not in MEMBER_DETAIL_ONLY_FIELDS]
 
 
 class CoachSerializer(serializers.ModelSerializer):
@@ -146,6 +163,13 @@ class EmailLogSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'sent_date']
 
 
+class EmailLogContentSerializer(EmailLogSerializer):
+    email_content = serializers.CharField(source='content', read_only=True)
+
+    class Meta(EmailLogSerializer.Meta):
+        fields = EmailLogSerializer.Meta.fields + ['email_content']
+
+
 class MemberCheckinSerializer(serializers.ModelSerializer):
     member = MemberSerializer(read_only=True)
 
@@ -168,18 +192,30 @@ class MemberStatsSerializer(serializers.Serializer):
     membership_types = serializers.DictField()
 
 
+class DailyStatsSnapshotSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DailyStatsSnapshot
+        exclude = ['updated_at']
+
+
 class MemberDashboardSerializer(serializers.Serializer):
     member = MemberSerializer()
     current_workout_plan = MemberWorkoutPlanSerializer()
     recent_workouts = WorkoutLogSerializer(many=True)
     upcoming_sessions = TrainingSessionSerializer(many=True)
     workout_streak = serializers.IntegerField()
+    longest_streak = serializers.IntegerField()
     total_workouts = serializers.IntegerField()
     missed_workouts = serializers.IntegerField()
 
 
 class BulkMemberUploadSerializer(serializers.Serializer):
     file = serializers.FileField()
+    mode = serializers.ChoiceField(
+        choices=ImportJob.MODE_CHOICES,
+        default='create',
+        help_text="'upsert' updates members whose email already exists instead of rejecting the row"
+    )
 
     def validate_file(self, value):
         if not value.name.endswith(('.xlsx', '.xls', '.csv')):
@@ -187,6 +223,21 @@ class BulkMemberUploadSerializer(serializers.Serializer):
         return value
 
 
+class ImportJobSerializer(serializers.ModelSerializer):
+    file_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ImportJob
+        fields = [
+            'id', 'file_name', 'mode', 'status', 'total_rows', 'processed_rows', 'created_count',
+            'updated_count', 'unchanged_count', 'error_count', 'errors', 'error_message', 'created_at', 'started_at', 'completed_at'
+        ]
+        read_only_fields = fields
+
+    def get_file_name(self, obj):
+        return obj.file.name.rsplit('/', 1)[-1]
+
+
 class EmailSendSerializer(serializers.Serializer):
     email_type = serializers.ChoiceField(choices=EmailLog.EMAIL_TYPES)
     member_ids = serializers.ListField(
@@ -197,4 +248,8 @@ class EmailSendSerializer(serializers.Serializer):
     force_send = serializers.BooleanField(
         default=False,
         help_text="Force send even if recently sent to the same member"
+    )
+    dry_run = serializers.BooleanField(
+        default=False,
+        help_text="Time the campaign on a sample of the recipients without sending or logging anything"
     )
\ No newline at end of file
@@ -0,0 +1,73 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from .dashboard import bump_dashboard_version
+from .models import Member, MemberCheckin, MemberWorkoutPlan, TrainingSession, WorkoutLog
+from .stats import invalidate_member_stats
+from .streaks import record_completed_workout, refresh_streaks
+
+
+def _dashboards_changed(*member_ids):
+    # After commit, like the stats, so the old data can't be cached again
+    # under the new version
+    if member_ids:
+        transaction.on_commit(lambda: bump_dashboard_version(*member_ids))
+
+
+@receiver(post_save, sender=Member)
+@receiver(post_delete, sender=Member)
+def member_changed(sender, instance, **kwargs):
+    # After commit, so a concurrent request can't cache the old counts again
+    transaction.on_commit(invalidate_member_stats)
+    _dashboards_changed(instance.pk)
+
+
+@receiver(post_save, sender=WorkoutLog)
+def workout_log_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created and instance.completed:
+        record_completed_workout(instance.member_id, instance.date)
+    elif not created:
+        # The date or completed flag may have changed; the old values are gone
+        refresh_streaks(instance.member_id)
+    _dashboards_changed(instance.member_id)
+
+
+@receiver(post_delete, sender=WorkoutLog)
+def workout_log_deleted(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, Member):
+        # Cascading from the member's own deletion
+        return
+    refresh_streaks(instance.member_id)
+    _dashboards_changed(instance.member_id)
+
+
+@receiver(post_save, sender=MemberCheckin)
+@receiver(post_delete, sender=MemberCheckin)
+@receiver(post_save, sender=MemberWorkoutPlan)
+@receiver(post_delete, sender=MemberWorkoutPlan)
+def member_activity_changed(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, Member):
+        return
+    _dashboards_changed(instance.member_id)
+
+
+@receiver(post_save, sender=TrainingSession)
+@receiver(pre_delete, sender=TrainingSession)
+def training_session_changed(sender, instance, created=False, **kwargs):
+    # A new session has no members yet; they arrive through m2m_changed
+    if not created:
+        _dashboards_changed(*instance.members.values_list('pk', flat=True))
+
+
+@receiver(m2m_changed, sender=TrainingSession.members.through)
+def training_session_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # member.training_sessions changed
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            _dashboards_changed(instance.pk)
+    elif action in ('post_add', 'post_remove'):
+        _dashboards_changed(*pk_set)
+    elif action == 'pre_clear':
+        _dashboards_changed(*instance.members.values_list('pk', flat=True))
@@ -0,0 +1,106 @@
+from datetime import date, datetime, time, timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+from .models import DailyStatsSnapshot, Member, MemberCheckin
+
+
+def _cache_key(today):
+    # Dated so the counts roll over at midnight without an invalidation
+    return f'member-stats:{today.isoformat()}'
+
+
+def compute_member_stats(today=None):
+    """
+    The dashboard member counts, all from one conditional aggregate over
+    the member table.
+    """
+    today = today or date.today()
+    month_start = timezone.make_aware(datetime.combine(today.replace(day=1), time.min))
+    active = Q(is_active=True)
+
+    aggregates = {
+        'total_members': Count('id'),
+        'active_members': Count('id', filter=active),
+        'due_soon': Count('id', filter=active & Q(
+            subscription_due_date__gte=today,
+            subscription_due_date__lte=today + timedelta(days=5),
+        )),
+        'overdue': Count('id', filter=active & Q(subscription_due_date__lt=today)),
+        'birthdays_today': Count('id', filter=active & Member.birthday_between(today)),
+        'new_this_month': Count('id', filter=Q(created_at__gte=month_start)),
+    }
+    for membership_type, _ in Member.MEMBERSHIP_TYPES:
+        aggregates[f'type_{membership_type}'] = Count('id', filter=Q(membership_type=membership_type))
+
+    counts = Member.objects.order_by().aggregate(**aggregates)
+
+    membership_types = {}
+    for membership_type, _ in Member.MEMBERSHIP_TYPES:
+        count = counts.pop(f'type_{membership_type}')
+        if count:
+            membership_types[membership_type] = count
+
+    return dict(
+        counts,
+        inactive_members=counts['total_members'] - counts['active_members'],
+        membership_types=membership_types,
+    )
+
+
+def member_stats(today=None):
+    """
+    compute_member_stats(), cached for MEMBER_STATS_CACHE_TTL seconds and
+    dropped whenever a member is saved or deleted (see signals.py).
+    """
+    today = today or date.today()
+    key = _cache_key(today)
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_member_stats(today)
+        cache.set(key, stats, getattr(settings, 'MEMBER_STATS_CACHE_TTL', 60))
+    return stats
+
+
+def invalidate_member_stats():
+    """
+    Drop the cached stats. Called by the Member signals; code that changes
+    members without save()/delete() (bulk_create, update()) calls it itself.
+    """
+    cache.delete(_cache_key(date.today()))
+
+
+def take_daily_snapshot(day=None):
+    """
+    Write (or rewrite) the DailyStatsSnapshot for `day`, yesterday by
+    default since the nightly task runs just after midnight. Member totals
+    are as of now; new members and check-ins are counted within the day.
+    """
+    day = day or date.today() - timedelta(days=1)
+    day_start = timezone.make_aware(datetime.combine(day, time.min))
+    day_end = day_start + timedelta(days=1)
+
+    stats = compute_member_stats(day)
+    new_members = Member.objects.filter(created_at__gte=day_start, created_at__lt=day_end).count()
+    checkins = MemberCheckin.objects.filter(
+        checkin_time__gte=day_start, checkin_time__lt=day_end
+    ).order_by().aggregate(
+        checkins=Count('id'),
+        members_checked_in=Count('member', distinct=True),
+    )
+
+    snapshot, _ = DailyStatsSnapshot.objects.update_or_create(
+        date=day,
+        defaults={
+            'total_members': stats['total_members'],
+            'active_members': stats['active_members'],
+            'inactive_members': stats['inactive_members'],
+            'due_soon': stats['due_soon'],
+            'overdue': stats['overdue'],
+            'new_members': new_members,
+            'membership_types': stats['membership_types'],
+            **checkins,
+        },
+    )
+    return snapshot
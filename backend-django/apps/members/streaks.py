@@ -0,0 +1,66 @@
+from datetime import timedelta
+from django.db import transaction
+from .models import Member, WorkoutLog
+
+
+def scan_streaks(dates):
+    """
+    (current, longest, last) for distinct workout dates in ascending order:
+    the length of the run ending at the last date, the longest run and the
+    last date itself.
+    """
+    current = longest = 0
+    previous = None
+    for day in dates:
+        if previous is not None and day - previous == timedelta(days=1):
+            current += 1
+        else:
+            current = 1
+        longest = max(longest, current)
+        previous = day
+    return current, longest, previous
+
+
+def completed_workout_dates(member_id):
+    return (
+        WorkoutLog.objects.filter(member_id=member_id, completed=True)
+        .order_by('date').values_list('date', flat=True).distinct()
+    )
+
+
+def refresh_streaks(member_id):
+    """
+    Recompute a member's streak fields from their completed workout dates,
+    fetched in one query.
+    """
+    current, longest, last = scan_streaks(completed_workout_dates(member_id))
+    Member.objects.filter(pk=member_id).update(
+        current_streak=current, longest_streak=longest, last_workout_date=last
+    )
+
+
+def record_completed_workout(member_id, day):
+    """
+    Extend a member's streak fields with a completed workout on `day`.
+    A workout on or after the last one is applied in place; one backdated
+    before it can join or split earlier runs, so that falls back to
+    refresh_streaks().
+    """
+    with transaction.atomic():
+        member = (
+            Member.objects.select_for_update()
+            .only('current_streak', 'longest_streak', 'last_workout_date')
+            .get(pk=member_id)
+        )
+        last = member.last_workout_date
+        if last is not None and day < last:
+            refresh_streaks(member_id)
+            return
+        if day == last:
+            return
+        current = member.current_streak + 1 if last == day - timedelta(days=1) else 1
+        Member.objects.filter(pk=member_id).update(
+            current_streak=current,
+            longest_streak=max(member.longest_streak, current),
+            last_workout_date=day,
+        )
@@ -1,350 +1,520 @@
-from celery import shared_task
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
+from celery import chord, group, shared_task
 from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
 from datetime import date, timedelta
-from .models import Member, EmailLog
+import random
+from .models import EmailLog, ImportJob
+from .mailer import CampaignMailer, RateLimited, build_message
+from .email_log import EmailLogWriter, store_body
+from .campaigns import CAMPAIGNS
+from .archive import archive_email_logs
+from .send_keys import get_send_key_reservations
+from .dry_run import dry_run_campaign
+from .progress import campaign_progress
+from .stats import take_daily_snapshot
+from .importers import ImportLeaseLost, run_import_job
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-@shared_task
-def send_subscription_reminders(member_ids=None, force_send=False):
+class CampaignDeferred(Exception):
     """
-    Send subscription reminder emails to members whose subscriptions are due soon
+    Raised by _send_campaign() when the outbound rate limit stops it
+    part-way. `result` has the counts so far and `handled_ids` the members
+    that already got a sent or failed EmailLog.
     """
-    today = date.today()
-    due_soon_date = today + timedelta(days=5)
-    
-    # Get members with subscriptions due in the next 5 days
-    queryset = Member.objects.filter(
-        subscription_due_date__gte=today,
-        subscription_due_date__lte=due_soon_date,
-        is_active=True
+
+    def __init__(self, result, handled_ids):
+        super().__init__("Campaign deferred by the outbound rate limit")
+        self.result = result
+        self.handled_ids = handled_ids
+
+
+def _add_counts(*results):
+    return {
+        'sent': sum(result['sent'] for result in results if result),
+        'failed': sum(result['failed'] for result in results if result),
+        'skipped': sum(result.get('skipped', 0) for result in results if result),
+    }
+
+
+def _retry_delay(attempts):
+    """
+    Seconds to wait before retrying a send that has failed `attempts` times:
+    exponential backoff capped at EMAIL_RETRY_MAX_DELAY, with jitter so a
+    burst of failures doesn't retry in lockstep.
+    """
+    base_delay = getattr(settings, 'EMAIL_RETRY_BASE_DELAY', 60)
+    max_delay = getattr(settings, 'EMAIL_RETRY_MAX_DELAY', 3600)
+    delay = min(max_delay, base_delay * 2 ** (attempts - 1))
+    return random.uniform(delay / 2, delay)
+
+
+def _next_retry_at(attempts):
+    if attempts >= getattr(settings, 'EMAIL_RETRY_MAX_ATTEMPTS', 5):
+        return None
+    return timezone.now() + timedelta(seconds=_retry_delay(attempts))
+
+
+def _schedule_retry(campaign, log_id, eta):
+    retry_failed_email.apply_async(
+        (str(log_id),), eta=eta, queue=campaign.queue, priority=campaign.priority
     )
-    
-    if member_ids:
-        queryset = queryset.filter(id__in=member_ids)
-    
-    sent_count = 0
-    failed_count = 0
-    
-    for member in queryset:
-        # Check if we've already sent a reminder recently (unless force_send)
-        if not force_send:
-            recent_log = EmailLog.objects.filter(
-                member=member,
-                email_type='subscription',
-                status='sent',
-                sent_date__gte=today - timedelta(days=1)
-            ).exists()
-            
-            if recent_log:
-                logger.info(f"Skipping {member.email} - reminder already sent recently")
-                continue
-        
-        try:
-            # Prepare email content
-            context = {
-                'member': member,
-                'days_until_due': member.days_until_due,
-                'frontend_url': settings.FRONTEND_URL if hasattr(settings, 'FRONTEND_URL') else 'http://localhost:5173',
-            }
-            
-            subject = f"Subscription Reminder - Due in {member.days_until_due} days"
-            html_content = render_to_string('emails/subscription_reminder.html', context)
-            text_content = render_to_string('emails/subscription_reminder.txt', context)
-            
-            # Send email
-            send_mail(
-                subject=subject,
-                message=text_content,
-                from_email=f"{settings.DEFAULT_FROM_NAME} <{settings.DEFAULT_FROM_EMAIL}>",
-                recipient_list=[member.email],
-                html_message=html_content,
-                fail_silently=False,
-            )
-            
-            # Log successful send
-            EmailLog.objects.create(
-                member=member,
-                email_type='subscription',
-                status='sent',
-                email_subject=subject,
-                email_content=html_content
-            )
-            
-            sent_count += 1
-            logger.info(f"Subscription reminder sent to {member.email}")
-            
-        except Exception as e:
-            # Log failed send
-            EmailLog.objects.create(
-                member=member,
-                email_type='subscription',
-                status='failed',
-                error_message=str(e),
-                email_subject=subject if 'subject' in locals() else 'Subscription Reminder'
-            )
-            
-            failed_count += 1
-            logger.error(f"Failed to send subscription reminder to {member.email}: {str(e)}")
-    
-    logger.info(f"Subscription reminders completed: {sent_count} sent, {failed_count} failed")
-    return {'sent': sent_count, 'failed': failed_count}
 
 
-@shared_task
-def send_motivational_emails(member_ids=None, force_send=False):
+def _schedule_retries(campaign, logs):
+    for log in logs:
+        if log.next_retry_at:
+            _schedule_retry(campaign, log.pk, log.next_retry_at)
+
+
+def _send_campaign(campaign, queryset, force_send=False, progress=None):
     """
-    Send motivational emails to active members
+    Render and send `campaign` to every member in `queryset` over a shared
+    mail connection, logging every send to EmailLog through a buffered writer.
+    Members are streamed from the database with only the columns the
+    campaign needs, rather than loading the whole queryset.
+
+    Unless force_send, each batch first reserves the members' send keys;
+    members whose key is held by another run are skipped, so overlapping
+    or repeated runs don't email anyone twice in a period.
+
+    Raises CampaignDeferred if the rate limiter makes the rest wait.
+
+    Failed sends are scheduled for retry once their EmailLog rows are written.
+    Counts are added to `progress` (a progress.CampaignProgress) per batch.
     """
+    email_type = campaign.email_type
+    label = campaign.label
+    iterator_chunk_size = getattr(settings, 'EMAIL_CAMPAIGN_ITERATOR_CHUNK_SIZE', 200)
+    reservations = get_send_key_reservations()
     today = date.today()
-    
-    # Get active members
-    queryset = Member.objects.filter(is_active=True)
-    
-    if member_ids:
-        queryset = queryset.filter(id__in=member_ids)
-    
     sent_count = 0
     failed_count = 0
-    
-    for member in queryset:
-        # Check if we've already sent a motivational email recently (unless force_send)
+    skipped_count = 0
+    pending = []
+    handled_ids = set()
+    failed_logs = []
+    reported = {'sent': 0, 'failed': 0, 'skipped': 0}
+
+    def report():
+        if not progress:
+            return
+        counts = {'sent': sent_count, 'failed': failed_count, 'skipped': skipped_count}
+        progress.add(**{name: counts[name] - reported[name] for name in counts})
+        reported.update(counts)
+
+    def flush(mailer, log_writer):
+        nonlocal sent_count, failed_count, skipped_count
         if not force_send:
-            recent_log = EmailLog.objects.filter(
-                member=member,
-                email_type='motivational',
-                status='sent',
-                sent_date__gte=today - timedelta(days=7)  # Once per week
-            ).exists()
-            
-            if recent_log:
-                logger.info(f"Skipping {member.email} - motivational email already sent recently")
-                continue
-        
+            held = reservations.reserve([item[-1] for item in pending], campaign.send_key_ttl)
+            for member, *_, send_key in pending:
+                if send_key not in held:
+                    handled_ids.add(str(member.pk))
+                    skipped_count += 1
+                    logger.info(f"{label} to {member.email} already sent by another run, skipping")
+            pending[:] = [item for item in pending if item[-1] in held]
+
         try:
-            # Prepare email content
-            context = {
-                'member': member,
-                'frontend_url': settings.FRONTEND_URL if hasattr(settings, 'FRONTEND_URL') else 'http://localhost:5173',
-            }
-            
-            subject = "Stay Strong! Your Fitness Journey Continues"
-            html_content = render_to_string('emails/motivational_email.html', context)
-            text_content = render_to_string('emails/motivational_email.txt', context)
-            
-            # Send email
-            send_mail(
-                subject=subject,
-                message=text_content,
-                from_email=f"{settings.DEFAULT_FROM_NAME} <{settings.DEFAULT_FROM_EMAIL}>",
-                recipient_list=[member.email],
-                html_message=html_content,
-                fail_silently=False,
-            )
-            
-            # Log successful send
-            EmailLog.objects.create(
-                member=member,
-                email_type='motivational',
-                status='sent',
-                email_subject=subject,
-                email_content=html_content
-            )
-            
-            sent_count += 1
-            logger.info(f"Motivational email sent to {member.email}")
-            
-        except Exception as e:
-            # Log failed send
-            EmailLog.objects.create(
-                member=member,
-                email_type='motivational',
-                status='failed',
-                error_message=str(e),
-                email_subject=subject if 'subject' in locals() else 'Motivational Email'
+            errors = mailer.send_batch([message for _, _, _, message, _ in pending])
+            deferred = False
+        except RateLimited as e:
+            errors = e.errors
+            deferred = True
+
+        # Keys of failed sends, and of sends a deferral left unattempted,
+        # are given back so the retry (or the requeued chunk) can take them
+        released = [item[-1] for item in pending[len(errors):]]
+
+        # With a deferral `errors` only covers the messages handled before it
+        for (member, subject, html_content, _, send_key), error in zip(pending, errors):
+            handled_ids.add(str(member.pk))
+            if error is None:
+                # Log successful send
+                log_writer.add(
+                    member=member,
+                    email_type=email_type,
+                    status='sent',
+                    email_subject=subject,
+                    email_content=html_content,
+                    send_key=send_key,
+                    template=campaign.template
+                )
+                sent_count += 1
+                logger.info(f"{label} sent to {member.email}")
+            else:
+                # Log failed send
+                failed_logs.append(log_writer.add(
+                    member=member,
+                    email_type=email_type,
+                    status='failed',
+                    error_message=str(error),
+                    email_subject=subject,
+                    send_key=send_key,
+                    next_retry_at=_next_retry_at(1)
+                ))
+                released.append(send_key)
+                failed_count += 1
+                logger.error(f"Failed to send {label.lower()} to {member.email}: {str(error)}")
+        pending.clear()
+
+        if not force_send:
+            reservations.release(released)
+        report()
+        if deferred:
+            raise CampaignDeferred(
+                {'sent': sent_count, 'failed': failed_count, 'skipped': skipped_count}, handled_ids
             )
-            
-            failed_count += 1
-            logger.error(f"Failed to send motivational email to {member.email}: {str(e)}")
-    
-    logger.info(f"Motivational emails completed: {sent_count} sent, {failed_count} failed")
-    return {'sent': sent_count, 'failed': failed_count}
+
+    try:
+        with CampaignMailer() as mailer, EmailLogWriter() as log_writer:
+            for member in queryset.only(*campaign.fields).iterator(chunk_size=iterator_chunk_size):
+                send_key = None if force_send else campaign.send_key(member.pk, today)
+                try:
+                    subject, text_content, html_content = campaign.build_email(member)
+                except Exception as e:
+                    failed_logs.append(log_writer.add(
+                        member=member,
+                        email_type=email_type,
+                        status='failed',
+                        error_message=str(e),
+                        email_subject=campaign.fallback_subject,
+                        send_key=send_key,
+                        next_retry_at=_next_retry_at(1)
+                    ))
+                    handled_ids.add(str(member.pk))
+                    failed_count += 1
+                    logger.error(f"Failed to render {label.lower()} for {member.email}: {str(e)}")
+                    continue
+
+                message = build_message(subject, text_content, html_content, member.email)
+                pending.append((member, subject, html_content, message, send_key))
+                if len(pending) >= mailer.batch_size:
+                    flush(mailer, log_writer)
+
+            if pending:
+                flush(mailer, log_writer)
+    finally:
+        _schedule_retries(campaign, failed_logs)
+        report()
+
+    return {'sent': sent_count, 'failed': failed_count, 'skipped': skipped_count}
+
+
+def _fan_out(email_type, member_ids=None, force_send=False, progress_id=None):
+    """
+    Select the eligible member IDs for a campaign and send them as a chord of
+    fixed-size chunk tasks, so the campaign spreads across every worker.
+    The per-chunk counts are merged by merge_campaign_results. Chunks and
+    callback go on the campaign's queue with its priority.
+
+    Live counters are kept under `progress_id`, the id of the calling task
+    (see progress.CampaignProgress).
+    """
+    campaign = CAMPAIGNS[email_type]
+    chunk_size = getattr(settings, 'EMAIL_CAMPAIGN_CHUNK_SIZE', 500)
+
+    eligible_ids = [
+        str(member_id) for member_id in
+        campaign.members(member_ids, force_send).values_list('id', flat=True).iterator()
+    ]
+    chunks = [
+        eligible_ids[start:start + chunk_size]
+        for start in range(0, len(eligible_ids), chunk_size)
+    ]
+    progress = campaign_progress(progress_id)
+    if progress:
+        progress.start(email_type, len(eligible_ids), len(chunks))
+
+    if not eligible_ids:
+        logger.info(f"{campaign.summary}: no eligible members")
+        if progress:
+            progress.finish()
+        return {'selected': 0, 'chunks': 0}
+
+    routing = {'queue': campaign.queue, 'priority': campaign.priority}
+    header = group(
+        send_email_chunk.s(email_type, chunk, force_send, progress_id=progress_id).set(**routing)
+        for chunk in chunks
+    )
+    callback = chord(header)(merge_campaign_results.s(email_type, progress_id=progress_id).set(**routing))
+
+    logger.info(f"{campaign.summary}: {len(eligible_ids)} members in {len(chunks)} chunks")
+    return {'selected': len(eligible_ids), 'chunks': len(chunks), 'callback_id': callback.id}
+
+
+@shared_task(bind=True, max_retries=None)
+def send_email_chunk(self, email_type, member_ids, force_send=False, carried=None, progress_id=None):
+    """
+    Send one chunk of a campaign. Eligibility is checked again here since
+    another run may have emailed some of these members since selection;
+    those count as skipped.
+
+    If the outbound rate limit holds the chunk up, the members not handled
+    yet are requeued (as a retry of this task, so the chord still waits for
+    it) and the counts so far are carried over.
+    """
+    campaign = CAMPAIGNS[email_type]
+    progress = campaign_progress(progress_id)
+    queryset = campaign.members(member_ids, force_send)
+    try:
+        result = _send_campaign(campaign, queryset, force_send, progress)
+    except CampaignDeferred as e:
+        remaining_ids = [member_id for member_id in member_ids if member_id not in e.handled_ids]
+        logger.info(f"{campaign.summary}: rate limited, requeueing {len(remaining_ids)} members")
+        raise self.retry(
+            args=(email_type, remaining_ids, force_send),
+            kwargs={'carried': _add_counts(carried, e.result), 'progress_id': progress_id},
+            countdown=getattr(settings, 'EMAIL_RATE_LIMIT_RETRY_DELAY', 30),
+            queue=campaign.queue,
+            priority=campaign.priority,
+        )
+
+    no_longer_eligible = len(member_ids) - (result['sent'] + result['failed'] + result['skipped'])
+    result['skipped'] += no_longer_eligible
+    if progress:
+        progress.add(skipped=no_longer_eligible)
+        progress.chunk_done()
+    return _add_counts(carried, result)
 
 
 @shared_task
-def send_birthday_wishes(member_ids=None, force_send=False):
+def merge_campaign_results(results, email_type, progress_id=None):
     """
-    Send birthday wishes to members whose birthday is today
+    Chord callback: add up the sent/failed counts of every chunk
     """
-    today = date.today()
-    
-    # Get members with birthday today
-    queryset = Member.objects.filter(
-        birthday__month=today.month,
-        birthday__day=today.day,
-        is_active=True
+    totals = _add_counts(*results)
+    progress = campaign_progress(progress_id)
+    if progress:
+        progress.finish()
+
+    logger.info(
+        f"{CAMPAIGNS[email_type].summary} completed: "
+        f"{totals['sent']} sent, {totals['failed']} failed, {totals['skipped']} skipped"
     )
-    
-    if member_ids:
-        queryset = queryset.filter(id__in=member_ids)
-    
-    sent_count = 0
-    failed_count = 0
-    
-    for member in queryset:
-        # Check if we've already sent a birthday wish today (unless force_send)
-        if not force_send:
-            recent_log = EmailLog.objects.filter(
-                member=member,
-                email_type='birthday',
-                status='sent',
-                sent_date__date=today
-            ).exists()
-            
-            if recent_log:
-                logger.info(f"Skipping {member.email} - birthday wish already sent today")
-                continue
-        
-        try:
-            # Calculate age if birth year is available
-            age = None
-            if member.birthday and member.birthday.year > 1900:
-                age = today.year - member.birthday.year
-            
-            # Prepare email content
-            context = {
-                'member': member,
-                'age': age,
-                'frontend_url': settings.FRONTEND_URL if hasattr(settings, 'FRONTEND_URL') else 'http://localhost:5173',
-            }
-            
-            subject = f"Happy Birthday, {member.full_name.split()[0]}! 🎉"
-            html_content = render_to_string('emails/birthday_wish.html', context)
-            text_content = render_to_string('emails/birthday_wish.txt', context)
-            
-            # Send email
-            send_mail(
-                subject=subject,
-                message=text_content,
-                from_email=f"{settings.DEFAULT_FROM_NAME} <{settings.DEFAULT_FROM_EMAIL}>",
-                recipient_list=[member.email],
-                html_message=html_content,
-                fail_silently=False,
-            )
-            
-            # Log successful send
-            EmailLog.objects.create(
-                member=member,
-                email_type='birthday',
-                status='sent',
-                email_subject=subject,
-                email_content=html_content
-            )
-            
-            sent_count += 1
-            logger.info(f"Birthday wish sent to {member.email}")
-            
-        except Exception as e:
-            # Log failed send
-            EmailLog.objects.create(
-                member=member,
-                email_type='birthday',
-                status='failed',
-                error_message=str(e),
-                email_subject=subject if 'subject' in locals() else 'Birthday Wish'
+    return dict(totals, chunks=len(results))
+
+
+@shared_task(bind=True, max_retries=None)
+def retry_failed_email(self, log_id):
+    """
+    Retry one failed send, updating its EmailLog row in place.
+
+    The row is claimed first (failed -> pending, with a lease in
+    next_retry_at) so the scheduled retry and the sweeper can't both send
+    it. A member who is no longer eligible for the campaign, e.g. because
+    another run has since emailed them, is not retried, and neither is one
+    whose send key another run is holding right now.
+    """
+    now = timezone.now()
+    lease = now + timedelta(seconds=getattr(settings, 'EMAIL_RETRY_LEASE', 600))
+    # A pending row is only up for grabs once its holder's lease has run out
+    log = EmailLog.objects.select_related('member').filter(
+        Q(status='failed') | Q(status='pending', next_retry_at__lte=now),
+        pk=log_id, next_retry_at__isnull=False,
+    ).first()
+    if not log or not EmailLog.objects.filter(
+        pk=log.pk, status=log.status, attempts=log.attempts, next_retry_at=log.next_retry_at
+    ).update(status='pending', next_retry_at=lease):
+        return 'skipped'
+
+    campaign = CAMPAIGNS.get(log.email_type)
+    member = log.member
+    if not campaign or not campaign.members([member.pk]).exists():
+        EmailLog.objects.filter(pk=log.pk).update(status='failed', next_retry_at=None)
+        return 'not eligible'
+
+    reservations = get_send_key_reservations()
+    if log.send_key and not reservations.reserve([log.send_key], campaign.send_key_ttl):
+        EmailLog.objects.filter(pk=log.pk).update(status='failed', next_retry_at=None)
+        return 'not eligible'
+
+    attempts = log.attempts + 1
+    try:
+        subject, text_content, html_content = campaign.build_email(member)
+        with CampaignMailer() as mailer:
+            error = mailer.send_batch([build_message(subject, text_content, html_content, member.email)])[0]
+    except RateLimited:
+        # Not the send's fault: put the row back and try again later
+        if log.send_key:
+            reservations.release([log.send_key])
+        EmailLog.objects.filter(pk=log.pk).update(status='failed', next_retry_at=log.next_retry_at)
+        raise self.retry(
+            countdown=getattr(settings, 'EMAIL_RATE_LIMIT_RETRY_DELAY', 30),
+            queue=campaign.queue,
+            priority=campaign.priority,
+        )
+    except Exception as e:
+        subject, html_content, error = log.email_subject, '', e
+
+    if error is None:
+        # The body and the row pointing at it commit together (see archive.py)
+        with transaction.atomic():
+            sent = dict(
+                status='sent', attempts=attempts, error_message='', next_retry_at=None,
+                email_subject=subject, body=store_body(campaign.template, html_content),
+                sent_date=timezone.now()
             )
-            
-            failed_count += 1
-            logger.error(f"Failed to send birthday wish to {member.email}: {str(e)}")
-    
-    logger.info(f"Birthday wishes completed: {sent_count} sent, {failed_count} failed")
-    return {'sent': sent_count, 'failed': failed_count}
+            try:
+                with transaction.atomic():
+                    EmailLog.objects.filter(pk=log.pk).update(**sent)
+            except IntegrityError:
+                # Another row was sent under this key while reservations were
+                # unavailable; record the send anyway, without the key
+                EmailLog.objects.filter(pk=log.pk).update(send_key=None, **sent)
+        logger.info(f"{campaign.label} sent to {member.email} on attempt {attempts}")
+        return 'sent'
+
+    if log.send_key:
+        reservations.release([log.send_key])
+    next_retry_at = _next_retry_at(attempts)
+    EmailLog.objects.filter(pk=log.pk).update(
+        status='failed', attempts=attempts, error_message=str(error), next_retry_at=next_retry_at
+    )
+    if next_retry_at:
+        _schedule_retry(campaign, log.pk, next_retry_at)
+        logger.warning(f"Retry {attempts} of {campaign.label.lower()} to {member.email} failed: {str(error)}")
+    else:
+        logger.error(f"Giving up on {campaign.label.lower()} to {member.email} after {attempts} attempts: {str(error)}")
+    return 'failed'
 
 
 @shared_task
-def send_inactivity_alerts(member_ids=None, force_send=False):
+def sweep_failed_emails():
+    """
+    Re-dispatch retries that are overdue, i.e. whose scheduled retry task
+    was lost (worker restart, broker flush) or whose claim lease expired.
+    Only rows that are still failed or stuck pending are picked up.
+    """
+    grace = timedelta(seconds=getattr(settings, 'EMAIL_RETRY_SWEEP_GRACE', 300))
+    overdue = EmailLog.objects.filter(
+        status__in=['failed', 'pending'],
+        next_retry_at__lte=timezone.now() - grace,
+    ).values_list('id', 'email_type')
+
+    count = 0
+    for log_id, email_type in overdue.iterator():
+        campaign = CAMPAIGNS.get(email_type)
+        if campaign:
+            _schedule_retry(campaign, log_id, None)
+        else:
+            retry_failed_email.delay(str(log_id))
+        count += 1
+
+    logger.info(f"Email retry sweep re-dispatched {count} sends")
+    return {'dispatched': count}
+
+
+@shared_task
+def archive_old_email_logs():
+    """
+    Move email logs past EMAIL_LOG_RETENTION_DAYS out of the database into
+    the monthly archive files
+    """
+    result = archive_email_logs()
+    logger.info(f"Archived {result['archived']} email logs, purged {result['bodies_purged']} unused bodies")
+    return result
+
+
+@shared_task
+def snapshot_daily_stats():
+    """
+    Store yesterday's member stats as a DailyStatsSnapshot
+    """
+    snapshot = take_daily_snapshot()
+    logger.info(f"Stored member stats snapshot for {snapshot.date}")
+    return str(snapshot.date)
+
+
+@shared_task(bind=True, acks_late=True, reject_on_worker_lost=True)
+def process_import_job(self, job_id):
+    """
+    Import the members of an uploaded ImportJob. Acknowledged only once
+    done, so a job whose worker dies is redelivered and resumes from its
+    last committed chunk. A delivery that finds the job completed or held
+    by another worker does nothing; resume_stale_import_jobs picks up jobs
+    whose lease ran out.
+    """
+    try:
+        job = run_import_job(job_id)
+    except ImportLeaseLost as e:
+        logger.warning(str(e))
+        return 'taken over'
+    except Exception as e:
+        logger.error(f"Import job {job_id} failed: {str(e)}")
+        ImportJob.objects.filter(pk=job_id, status='running').update(
+            status='failed', error_message=str(e), lease_expires_at=None
+        )
+        raise
+    if job is None:
+        return 'skipped'
+    logger.info(f"Import job {job_id}: {job.created_count} members created, {job.error_count} rows rejected")
+    return {'created': job.created_count, 'errors': job.error_count}
+
+
+@shared_task
+def resume_stale_import_jobs():
+    """
+    Re-dispatch import jobs whose worker stopped renewing its lease (a crash
+    the broker didn't redeliver), and pending jobs whose task was lost.
+    """
+    now = timezone.now()
+    grace = timedelta(seconds=getattr(settings, 'MEMBER_IMPORT_LEASE', 600))
+    stale = ImportJob.objects.filter(
+        Q(status='running', lease_expires_at__lt=now) | Q(status='pending', created_at__lt=now - grace)
+    ).values_list('id', flat=True)
+
+    count = 0
+    for job_id in stale.iterator():
+        process_import_job.delay(str(job_id))
+        count += 1
+
+    logger.info(f"Import job sweep re-dispatched {count} jobs")
+    return {'dispatched': count}
+
+
+@shared_task(bind=True)
+def run_campaign(self, email_type, member_ids=None, force_send=False, dry_run=False):
+    """
+    Run the campaign registered for `email_type` in campaigns.CAMPAIGNS.
+    With dry_run nothing is sent or kept; the result has per-stage timings
+    and the projected run time instead (see dry_run.dry_run_campaign).
+    """
+    if dry_run:
+        return dry_run_campaign(email_type, member_ids, force_send)
+    return _fan_out(email_type, member_ids, force_send, progress_id=self.request.id)
+
+
+@shared_task(bind=True)
+def send_subscription_reminders(self, member_ids=None, force_send=False):
+    """
+    Send subscription reminder emails to members whose subscriptions are due soon
+    """
+    return _fan_out('subscription', member_ids, force_send, progress_id=self.request.id)
+
+
+@shared_task(bind=True)
+def send_motivational_emails(self, member_ids=None, force_send=False):
+    """
+    Send motivational emails to active members
+    """
+    return _fan_out('motivational', member_ids, force_send, progress_id=self.request.id)
+
+
+@shared_task(bind=True)
+def send_birthday_wishes(self, member_ids=None, force_send=False):
+    """
+    Send birthday wishes to members whose birthday is today
+    """
+    return _fan_out('birthday', member_ids, force_send, progress_id=self.request.id)
+
+
+@shared_task(bind=True)
+def send_inactivity_alerts(self, member_ids=None, force_send=False):
     """
     Send inactivity alerts to members who haven't checked in for 7+ days
     """
-    today = date.today()
-    inactive_threshold = today - timedelta(days=7)
-    
-    # Get members who haven't checked in for 7+ days
-    queryset = Member.objects.filter(
-        is_active=True,
-        last_checkin_date__lt=inactive_threshold
-    )
-    
-    if member_ids:
-        queryset = queryset.filter(id__in=member_ids)
-    
-    sent_count = 0
-    failed_count = 0
-    
-    for member in queryset:
-        # Check if we've already sent an inactivity alert recently (unless force_send)
-        if not force_send:
-            recent_log = EmailLog.objects.filter(
-                member=member,
-                email_type='inactivity',
-                status='sent',
-                sent_date__gte=today - timedelta(days=7)
-            ).exists()
-            
-            if recent_log:
-                logger.info(f"Skipping {member.email} - inactivity alert already sent recently")
-                continue
-        
-        try:
-            # Prepare email content
-            context = {
-                'member': member,
-                'days_since_checkin': member.days_since_checkin,
-                'frontend_url': settings.FRONTEND_URL if hasattr(settings, 'FRONTEND_URL') else 'http://localhost:5173',
-            }
-            
-            subject = "We Miss You! Come Back to the Gym"
-            html_content = render_to_string('emails/inactivity_alert.html', context)
-            text_content = render_to_string('emails/inactivity_alert.txt', context)
-            
-            # Send email
-            send_mail(
-                subject=subject,
-                message=text_content,
-                from_email=f"{settings.DEFAULT_FROM_NAME} <{settings.DEFAULT_FROM_EMAIL}>",
-                recipient_list=[member.email],
-                html_message=html_content,
-                fail_silently=False,
-            )
-            
-            # Log successful send
-            EmailLog.objects.create(
-                member=member,
-                email_type='inactivity',
-                status='sent',
-                email_subject=subject,
-                email_content=html_content
-            )
-            
-            sent_count += 1
-            logger.info(f"Inactivity alert sent to {member.email}")
-            
-        except Exception as e:
-            # Log failed send
-            EmailLog.objects.create(
-                member=member,
-                email_type='inactivity',
-                status='failed',
-                error_message=str(e),
-                email_subject=subject if 'subject' in locals() else 'Inactivity Alert'
-            )
-            
-            failed_count += 1
-            logger.error(f"Failed to send inactivity alert to {member.email}: {str(e)}")
-    
-    logger.info(f"Inactivity alerts completed: {sent_count} sent, {failed_count} failed")
-    return {'sent': sent_count, 'failed': failed_count}
\ No newline at end of file
+    return _fan_out('inactivity', member_ids, force_send, progress_id=self.request.id)
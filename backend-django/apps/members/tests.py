@@ -0,0 +1,101 @@
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+from unittest import mock
+from django.contrib.auth.models import User
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from .archive import archive_email_logs, archived_months, read_archived_logs
+from .email_log import EmailLogWriter
+from .models import EmailLog, Member
+from .tasks import retry_failed_email
+from .views import MemberViewSet
+
+
+class MemberQueryCountTests(APITestCase):
+    """
+    The member endpoints take a fixed number of queries, however many
+    members a page holds: one for the count and one for the page (with the
+    user joined in) when listing, one for the member in detail.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', 'staff@example.com', 'password')
+        for i in range(30):
+            user = User.objects.create_user(f'member{i}', f'member{i}@example.com', 'password')
+            Member.objects.create(
+                user=user,
+                full_name=f'Member {i}',
+                email=f'member{i}@example.com',
+                subscription_due_date=date.today(),
+                notes='notes',
+            )
+
+    def setUp(self):
+        self.client.force_authenticate(self.staff)
+
+    def test_list_query_count_is_independent_of_page_size(self):
+        for page_size in (5, 30):
+            with self.subTest(page_size=page_size), \
+                    mock.patch.object(MemberViewSet.pagination_class, 'page_size', page_size):
+                with self.assertNumQueries(2):
+                    response = self.client.get('/api/members/api/members/')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data['results']), page_size)
+                self.assertNotIn('notes', response.data['results'][0])
+
+    def test_detail_query_count(self):
+        member = Member.objects.first()
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/members/api/members/{member.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['user']['username'], member.user.username)
+        self.assertEqual(response.data['notes'], 'notes')
+
+
+class EmailLogArchiveTests(TestCase):
+    """
+    Archived logs read back whole, including bulk-written rows whose
+    sent dates fall within the same millisecond.
+    """
+
+    def setUp(self):
+        archive_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(archive_dir.cleanup)
+        settings_override = override_settings(EMAIL_LOG_ARCHIVE_DIR=Path(archive_dir.name))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_bulk_written_logs_read_back(self):
+        member = Member.objects.create(
+            full_name='Member', email='member@example.com', subscription_due_date=date.today()
+        )
+        with EmailLogWriter() as log_writer:
+            for _ in range(200):
+                log_writer.add(member=member, email_type='motivational', status='sent')
+        EmailLog.objects.update(sent_date=F('sent_date') - timedelta(days=400))
+        ids = {str(pk) for pk in EmailLog.objects.values_list('pk', flat=True)}
+
+        self.assertEqual(archive_email_logs(batch_size=50)['archived'], 200)
+        rows = read_archived_logs(archived_months()[0])
+        self.assertEqual(len(rows), 200)
+        self.assertEqual({row['id'] for row in rows}, ids)
+        self.assertEqual([row['id'] for row in rows[10:20]], [row['id'] for row in list(rows)[10:20]])
+
+
+class RetryFailedEmailTests(TestCase):
+    def test_pending_row_within_its_lease_is_skipped(self):
+        member = Member.objects.create(
+            full_name='Member', email='member@example.com', subscription_due_date=date.today()
+        )
+        lease = timezone.now() + timedelta(minutes=10)
+        log = EmailLog.objects.create(
+            member=member, email_type='motivational', status='pending', next_retry_at=lease
+        )
+
+        self.assertEqual(retry_failed_email.apply(args=[log.pk]).get(), 'skipped')
+        log.refresh_from_db()
+        self.assertEqual((log.status, log.next_retry_at, log.attempts), ('pending', lease, 1))
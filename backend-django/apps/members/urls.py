@@ -9,6 +9,7 @@ router.register(r'workout-plans', views.WorkoutPlanViewSet)
 router.register(r'workout-logs', views.WorkoutLogViewSet)
 router.register(r'training-sessions', views.TrainingSessionViewSet)
 router.register(r'checkins', views.MemberCheckinViewSet)
+router.register(r'import-jobs', views.ImportJobViewSet)
 
 urlpatterns = [
     # API Routes
@@ -16,8 +17,10 @@ urlpatterns = [
     
     # Email management
     path('emails/logs/', views.EmailLogListView.as_view(), name='email-log-list'),
+    path('emails/logs/archives/', views.email_log_archives, name='email-log-archives'),
 
     path('api/emails/send/', views.SendEmailView.as_view(), name='send-email'),
+    path('api/emails/status/<str:task_id>/', views.EmailCampaignStatusView.as_view(), name='email-campaign-status'),
     path('api/emails/send-reminders/', views.send_subscription_reminders_view, name='send-reminders'),
     path('api/emails/send-motivational/', views.send_motivational_emails_view, name='send-motivational'),
     
@@ -32,4 +35,5 @@ urlpatterns = [
     path('', views.MemberViewSet.as_view({'get': 'list', 'post': 'create'}), name='member-list-create'),
     path('<uuid:pk>/', views.MemberViewSet.as_view({'get': 'retrieve', 'put': 'update', 'delete': 'destroy'}), name='member-detail'),
     path('stats/', views.MemberViewSet.as_view({'get': 'stats'}), name='member-stats'),
+    path('stats/history/', views.MemberViewSet.as_view({'get': 'stats_history'}), name='member-stats-history'),
 ]
\ No newline at end of file
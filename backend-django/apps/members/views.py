@@ -1,6 +1,9 @@
 import pandas as pd
+import redis
+from celery.result import AsyncResult
 from datetime import date, timedelta
-from django.db.models import Q, Count, Avg
+from django.db.models import Q, Avg
+from django.conf import settings
 from django.utils import timezone
 from django.contrib.auth.models import User
 from rest_framework import generics, status, filters
@@ -8,24 +11,28 @@ from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.viewsets import ModelViewSet
+from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 from rest_framework.parsers import MultiPartParser, FormParser
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import (
     Member, Coach, WorkoutPlan, WorkoutSession, MemberWorkoutPlan,
-    WorkoutLog, CoachSchedule, TrainingSession, EmailLog, MemberCheckin
+    WorkoutLog, CoachSchedule, TrainingSession, EmailLog, MemberCheckin, DailyStatsSnapshot, ImportJob
 )
 from .serializers import (
-    MemberSerializer, CoachSerializer, WorkoutPlanSerializer, WorkoutSessionSerializer,
+    MemberSerializer, MemberListSerializer, MEMBER_DETAIL_ONLY_FIELDS, CoachSerializer, WorkoutPlanSerializer, WorkoutSessionSerializer,
     MemberWorkoutPlanSerializer, WorkoutLogSerializer, CoachScheduleSerializer,
-    TrainingSessionSerializer, EmailLogSerializer, MemberCheckinSerializer,
+    TrainingSessionSerializer, EmailLogSerializer, EmailLogContentSerializer, MemberCheckinSerializer,
     MemberStatsSerializer, MemberDashboardSerializer, BulkMemberUploadSerializer,
-    EmailSendSerializer
+    EmailSendSerializer, DailyStatsSnapshotSerializer, ImportJobSerializer
 )
 from .filters import MemberFilter
+from .campaigns import CAMPAIGNS
+from .archive import archived_months, read_archived_logs
+from .progress import campaign_progress
+from .dashboard import cached_dashboard
+from .stats import member_stats
 from .tasks import (
-    send_subscription_reminders, send_motivational_emails,
-    send_birthday_wishes, send_inactivity_alerts
+    process_import_job, run_campaign, send_subscription_reminders, send_motivational_emails
 )
 
 
@@ -39,64 +46,63 @@ class MemberViewSet(ModelViewSet):
     ordering_fields = ['full_name', 'subscription_due_date', 'created_at', 'last_checkin_date']
     ordering = ['-created_at']
 
+    def get_queryset(self):
+        # The nested user comes from the same query; list rows also skip
+        # the free-text columns they don't show
+        queryset = Member.objects.select_related('user')
+        if self.action == 'list':
+            queryset = queryset.defer(*MEMBER_DETAIL_ONLY_FIELDS)
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return MemberListSerializer
+        return MemberSerializer
+
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        today = date.today()
-        month_start = today.replace(day=1)
-        
-        total_members = Member.objects.count()
-        active_members = Member.objects.filter(is_active=True).count()
-        inactive_members = total_members - active_members
-        
-        due_soon_date = today + timedelta(days=5)
-        due_soon = Member.objects.filter(
-            subscription_due_date__gte=today,
-            subscription_due_date__lte=due_soon_date,
-            is_active=True
-        ).count()
-        
-        overdue = Member.objects.filter(
-            subscription_due_date__lt=today,
-            is_active=True
-        ).count()
-        
-        birthdays_today = Member.objects.filter(
-            birthday__month=today.month,
-            birthday__day=today.day,
-            is_active=True
-        ).count()
-        
-        new_this_month = Member.objects.filter(
-            created_at__gte=month_start
-        ).count()
-        
-        membership_types = dict(
-            Member.objects.values_list('membership_type').annotate(
-                count=Count('membership_type')
-            )
-        )
-        
-        stats = {
-            'total_members': total_members,
-            'active_members': active_members,
-            'inactive_members': inactive_members,
-            'due_soon': due_soon,
-            'overdue': overdue,
-            'birthdays_today': birthdays_today,
-            'new_this_month': new_this_month,
-            'membership_types': membership_types,
-        }
-        
-        serializer = MemberStatsSerializer(stats)
+        serializer = MemberStatsSerializer(member_stats())
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'], url_path='stats/history')
+    def stats_history(self, request):
+        """
+        Daily stats snapshots from `start` to `end` (YYYY-MM-DD, default the
+        last `days` days, 90 by default), oldest first. The range is capped
+        at STATS_HISTORY_MAX_DAYS.
+        """
+        max_days = getattr(settings, 'STATS_HISTORY_MAX_DAYS', 366)
+        try:
+            end = date.fromisoformat(request.query_params['end']) if 'end' in request.query_params else date.today()
+            if 'start' in request.query_params:
+                start = date.fromisoformat(request.query_params['start'])
+            else:
+                start = end - timedelta(days=int(request.query_params.get('days', 90)) - 1)
+        except ValueError:
+            return Response(
+                {'error': 'Use YYYY-MM-DD for start/end and a whole number for days'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if start > end or (end - start).days >= max_days:
+            return Response(
+                {'error': f'The range must run forwards and span at most {max_days} days'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        snapshots = DailyStatsSnapshot.objects.filter(date__gte=start, date__lte=end).order_by('date')
+        serializer = DailyStatsSnapshotSerializer(snapshots, many=True)
+        return Response({'start': start, 'end': end, 'results': serializer.data})
+
     @action(detail=True, methods=['get'])
     def dashboard(self, request, pk=None):
         member = self.get_object()
-        
+        return Response(cached_dashboard(member.pk, 'member', lambda: self._dashboard_data(member)))
+
+    def _dashboard_data(self, member):
         # Get current workout plan
         current_plan = MemberWorkoutPlan.objects.filter(
             member=member, is_active=True
@@ -114,9 +120,6 @@ class MemberViewSet(ModelViewSet):
             status='scheduled'
         ).order_by('date', 'start_time')[:5]
         
-        # Calculate workout streak
-        workout_streak = self._calculate_workout_streak(member)
-        
         # Total workouts
         total_workouts = WorkoutLog.objects.filter(member=member, completed=True).count()
         
@@ -128,32 +131,13 @@ class MemberViewSet(ModelViewSet):
             'current_workout_plan': current_plan,
             'recent_workouts': recent_workouts,
             'upcoming_sessions': upcoming_sessions,
-            'workout_streak': workout_streak,
+            'workout_streak': member.workout_streak,
+            'longest_streak': member.longest_streak,
             'total_workouts': total_workouts,
             'missed_workouts': missed_workouts,
         }
         
-        serializer = MemberDashboardSerializer(dashboard_data)
-        return Response(serializer.data)
-
-    def _calculate_workout_streak(self, member):
-        # Calculate consecutive days with workouts
-        today = date.today()
-        streak = 0
-        current_date = today
-        
-        while True:
-            if WorkoutLog.objects.filter(
-                member=member, 
-                date=current_date, 
-                completed=True
-            ).exists():
-                streak += 1
-                current_date -= timedelta(days=1)
-            else:
-                break
-                
-        return streak
+        return MemberDashboardSerializer(dashboard_data).data
 
     @action(detail=False, methods=['post'], parser_classes=[MultiPartParser, FormParser])
     def bulk_upload(self, request):
@@ -162,55 +146,42 @@ class MemberViewSet(ModelViewSet):
         
         file = serializer.validated_data['file']
         
-        try:
-            # Read the file
-            if file.name.endswith('.csv'):
-                df = pd.read_csv(file)
-            else:
-                df = pd.read_excel(file)
-            
-            created_count = 0
-            errors = []
-            
-            for index, row in df.iterrows():
-                try:
-                    # Map CSV columns to model fields
-                    member_data = {
-                        'full_name': row.get('full_name', ''),
-                        'email': row.get('email', ''),
-                        'phone': row.get('phone', ''),
-                        'subscription_due_date': pd.to_datetime(row.get('subscription_due_date')).date(),
-                        'membership_type': row.get('membership_type', 'basic'),
-                        'is_active': row.get('is_active', True),
-                    }
-                    
-                    # Optional fields
-                    if pd.notna(row.get('birthday')):
-                        member_data['birthday'] = pd.to_datetime(row.get('birthday')).date()
-                    
-                    if pd.notna(row.get('last_checkin_date')):
-                        member_data['last_checkin_date'] = pd.to_datetime(row.get('last_checkin_date')).date()
-                    
-                    # Create member
-                    member_serializer = MemberSerializer(data=member_data)
-                    if member_serializer.is_valid():
-                        member_serializer.save(created_by=request.user)
-                        created_count += 1
-                    else:
-                        errors.append(f"Row {index + 1}: {member_serializer.errors}")
-                        
-                except Exception as e:
-                    errors.append(f"Row {index + 1}: {str(e)}")
-            
-            return Response({
-                'message': f'Successfully created {created_count} members',
-                'errors': errors
-            }, status=status.HTTP_201_CREATED)
-            
-        except Exception as e:
-            return Response({
-                'error': f'Failed to process file: {str(e)}'
-            }, status=status.HTTP_400_BAD_REQUEST)
+        # Imported in the background; the job endpoint reports progress
+        job = ImportJob.objects.create(
+            file=file, mode=serializer.validated_data['mode'], created_by=request.user
+        )
+        process_import_job.delay(str(job.id))
+        return Response({
+            'message': f'Import started as job {job.id}',
+            'job_id': job.id,
+            **ImportJobSerializer(job).data,
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+class ImportJobViewSet(ReadOnlyModelViewSet):
+    """
+    Bulk member uploads and their progress. POST .../resume/ restarts a
+    failed job from its last committed chunk.
+    """
+    queryset = ImportJob.objects.all()
+    serializer_class = ImportJobSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['status']
+
+    @action(detail=True, methods=['post'])
+    def resume(self, request, pk=None):
+        job = self.get_object()
+        # Conditional, so two resumes can't both queue the job
+        if not ImportJob.objects.filter(pk=job.pk, status='failed').update(status='pending'):
+            job.refresh_from_db()
+            return Response(
+                {'error': f'Only failed jobs can be resumed, this one is {job.status}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        process_import_job.delay(str(job.id))
+        job.refresh_from_db()
+        return Response(ImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
 
 
 class CoachViewSet(ModelViewSet):
@@ -410,6 +381,52 @@ class EmailLogListView(generics.ListAPIView):
     filterset_fields = ['email_type', 'status', 'member']
     ordering = ['-sent_date']
 
+    def _include_content(self):
+        return self.request.query_params.get('include_content') in ('1', 'true', 'True')
+
+    def get_queryset(self):
+        queryset = EmailLog.objects.select_related('member')
+        if self._include_content():
+            # Bodies are decompressed from their template snapshot on demand
+            return queryset.select_related('body__snapshot')
+        return queryset.defer('email_content')
+
+    def get_serializer_class(self):
+        if self._include_content():
+            return EmailLogContentSerializer
+        return EmailLogSerializer
+
+    def list(self, request, *args, **kwargs):
+        # Logs past the retention period live in the monthly archive files
+        month = request.query_params.get('archived_month')
+        if not month:
+            return super().list(request, *args, **kwargs)
+
+        try:
+            rows = read_archived_logs(
+                month,
+                email_type=request.query_params.get('email_type'),
+                status=request.query_params.get('status'),
+                member=request.query_params.get('member'),
+                include_content=self._include_content(),
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(list(rows))
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def email_log_archives(request):
+    """
+    Months whose email logs have been archived, for ?archived_month=
+    """
+    return Response({'months': archived_months()})
+
 
 class SendEmailView(APIView):
     permission_classes = [IsAuthenticated]
@@ -421,29 +438,55 @@ class SendEmailView(APIView):
         email_type = serializer.validated_data['email_type']
         member_ids = serializer.validated_data.get('member_ids')
         force_send = serializer.validated_data.get('force_send', False)
+        dry_run = serializer.validated_data.get('dry_run', False)
         
-        task_map = {
-            'subscription': send_subscription_reminders,
-            'motivational': send_motivational_emails,
-            'birthday': send_birthday_wishes,
-            'inactivity': send_inactivity_alerts,
-        }
-        
-        task = task_map.get(email_type)
-        if not task:
+        if email_type not in CAMPAIGNS:
             return Response(
                 {'error': 'Invalid email type'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        task_result = task.delay(member_ids=member_ids, force_send=force_send)
+        task_result = run_campaign.delay(
+            email_type, member_ids=member_ids, force_send=force_send, dry_run=dry_run
+        )
         
         return Response({
-            'message': f'{email_type.title()} emails are being sent',
+            'message': (
+                f'{email_type.title()} email dry run started' if dry_run
+                else f'{email_type.title()} emails are being sent'
+            ),
             'task_id': task_result.id
         }, status=status.HTTP_202_ACCEPTED)
 
 
+class EmailCampaignStatusView(APIView):
+    """
+    Live progress of a campaign started through SendEmailView (or beat),
+    by the task_id it returned. Served from the run's counters in Redis,
+    without touching EmailLog.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, task_id):
+        try:
+            progress = campaign_progress(task_id).read()
+        except redis.RedisError:
+            return Response(
+                {'error': 'Campaign progress is unavailable'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        if progress:
+            return Response(progress)
+
+        # Not started yet, or a dry run, which reports through its result
+        result = AsyncResult(task_id)
+        return Response({
+            'task_id': task_id,
+            'status': result.state.lower(),
+            'result': result.result if result.successful() else None,
+        })
+
+
 # Member Portal Views (for members to access their own data)
 class MemberPortalDashboardView(APIView):
     permission_classes = [IsAuthenticated]
@@ -456,7 +499,9 @@ class MemberPortalDashboardView(APIView):
                 {'error': 'Member profile not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
-        
+        return Response(cached_dashboard(member.pk, 'portal', lambda: self._dashboard_data(member)))
+
+    def _dashboard_data(self, member):
         # Get current workout plan
         current_plan = MemberWorkoutPlan.objects.filter(
             member=member, is_active=True
@@ -483,17 +528,6 @@ class MemberPortalDashboardView(APIView):
             date__year=date.today().year
         ).count()
         
-        # Calculate workout streak
-        streak = 0
-        current_date = date.today()
-        while WorkoutLog.objects.filter(
-            member=member, 
-            date=current_date, 
-            completed=True
-        ).exists():
-            streak += 1
-            current_date -= timedelta(days=1)
-        
         dashboard_data = {
             'member': MemberSerializer(member).data,
             'current_workout_plan': MemberWorkoutPlanSerializer(current_plan).data if current_plan else None,
@@ -502,13 +536,14 @@ class MemberPortalDashboardView(APIView):
             'stats': {
                 'total_workouts': total_workouts,
                 'this_month_workouts': this_month_workouts,
-                'workout_streak': streak,
+                'workout_streak': member.workout_streak,
+                'longest_streak': member.longest_streak,
                 'membership_status': 'Active' if member.is_active else 'Inactive',
                 'days_until_due': member.days_until_due
             }
         }
         
-        return Response(dashboard_data)
+        return dashboard_data
 
 
 @api_view(['GET'])
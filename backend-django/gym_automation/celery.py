@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from celery.schedules import crontab
 import logging
 
 # Set the default Django settings module for the 'celery' program.
@@ -15,22 +16,40 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
 # Celery Beat Schedule
+# Fixed wall-clock times (app.conf.timezone): reminders go out in the
+# morning, the big campaigns and housekeeping run overnight off-peak.
 app.conf.beat_schedule = {
     'send-subscription-reminders': {
         'task': 'apps.members.tasks.send_subscription_reminders',
-        'schedule': 86400.0,  # Run daily (24 hours)
+        'schedule': crontab(hour=8, minute=0),  # Daily at 08:00
     },
     'send-motivational-emails': {
         'task': 'apps.members.tasks.send_motivational_emails',
-        'schedule': 604800.0,  # Run weekly (7 days)
+        'schedule': crontab(hour=4, minute=0, day_of_week='mon'),  # Mondays at 04:00
     },
     'send-birthday-wishes': {
         'task': 'apps.members.tasks.send_birthday_wishes',
-        'schedule': 86400.0,  # Run daily
+        'schedule': crontab(hour=7, minute=0),  # Daily at 07:00
     },
     'send-inactivity-alerts': {
         'task': 'apps.members.tasks.send_inactivity_alerts',
-        'schedule': 86400.0,  # Run daily
+        'schedule': crontab(hour=4, minute=30),  # Daily at 04:30
+    },
+    'sweep-failed-emails': {
+        'task': 'apps.members.tasks.sweep_failed_emails',
+        'schedule': crontab(minute='*/15'),  # Every 15 minutes
+    },
+    'resume-stale-import-jobs': {
+        'task': 'apps.members.tasks.resume_stale_import_jobs',
+        'schedule': crontab(minute='*/10'),  # Every 10 minutes
+    },
+    'snapshot-daily-stats': {
+        'task': 'apps.members.tasks.snapshot_daily_stats',
+        'schedule': crontab(hour=0, minute=10),  # Daily at 00:10, for the day before
+    },
+    'archive-old-email-logs': {
+        'task': 'apps.members.tasks.archive_old_email_logs',
+        'schedule': crontab(hour=3, minute=0),  # Daily at 03:00
     },
 }
 
@@ -172,6 +172,28 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Queues: 'transactional' for time-sensitive reminders, 'bulk' for large
+# campaigns and housekeeping, 'default' for everything else. Each queue gets
+# its own worker (see README) so a bulk campaign can't hold up reminders.
+# Campaign tasks pick their queue and priority from campaigns.CAMPAIGNS;
+# with Redis, priority 0 is served first.
+CELERY_TASK_DEFAULT_QUEUE = 'default'
+CELERY_TASK_DEFAULT_PRIORITY = 5
+CELERY_TASK_ROUTES = {
+    'apps.members.tasks.archive_old_email_logs': {'queue': 'bulk'},
+    'apps.members.tasks.process_import_job': {'queue': 'bulk'},
+}
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'queue_order_strategy': 'priority',
+    'priority_steps': list(range(10)),
+    'sep': ':',
+    # Seconds before an unacknowledged task is delivered again. acks_late
+    # tasks (import jobs) must finish well within it; the default is 1 hour
+    'visibility_timeout': config('CELERY_VISIBILITY_TIMEOUT', default=43200, cast=int),
+}
+# Reserve one task at a time so a worker's prefetch doesn't bypass priorities
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
 # Email Configuration
 EMAIL_BACKEND = 'anymail.backends.sendgrid.EmailBackend'
 ANYMAIL = {
@@ -181,6 +203,88 @@ ANYMAIL = {
 DEFAULT_FROM_EMAIL = config('FROM_EMAIL', default='noreply@yourgym.com')
 DEFAULT_FROM_NAME = config('FROM_NAME', default='Your Gym')
 
+# Campaign sending: members per Celery chunk task, and messages sent over one
+# mail connection before it is recycled
+EMAIL_CAMPAIGN_CHUNK_SIZE = config('EMAIL_CAMPAIGN_CHUNK_SIZE', default=500, cast=int)
+EMAIL_CAMPAIGN_ITERATOR_CHUNK_SIZE = 200  # rows fetched per round trip while streaming members
+EMAIL_SEND_BATCH_SIZE = config('EMAIL_SEND_BATCH_SIZE', default=100, cast=int)
+
+# Backend used for campaign emails, if not EMAIL_BACKEND. For SMTP with
+# concurrent sessions use 'apps.members.async_smtp.AsyncSMTPBackend'
+# (needs aiosmtplib and the EMAIL_HOST* settings) with up to
+# EMAIL_ASYNC_SMTP_POOL_SIZE sessions open at once.
+EMAIL_CAMPAIGN_BACKEND = config('EMAIL_CAMPAIGN_BACKEND', default='')
+EMAIL_ASYNC_SMTP_POOL_SIZE = config('EMAIL_ASYNC_SMTP_POOL_SIZE', default=10, cast=int)
+
+# EmailLog rows are buffered and bulk inserted every N rows or T seconds
+EMAIL_LOG_FLUSH_SIZE = config('EMAIL_LOG_FLUSH_SIZE', default=500, cast=int)
+EMAIL_LOG_FLUSH_INTERVAL = config('EMAIL_LOG_FLUSH_INTERVAL', default=5.0, cast=float)
+
+# Outbound email rate limit shared by all workers (token bucket in Redis).
+# EMAIL_RATE_LIMIT is messages per second, 0 disables it. Senders wait up to
+# EMAIL_RATE_LIMIT_MAX_WAIT seconds for a token, then requeue the rest of
+# their chunk after EMAIL_RATE_LIMIT_RETRY_DELAY seconds.
+EMAIL_RATE_LIMIT = config('EMAIL_RATE_LIMIT', default=0, cast=float)
+EMAIL_RATE_BURST = config('EMAIL_RATE_BURST', default=0, cast=int)
+EMAIL_RATE_LIMIT_MAX_WAIT = config('EMAIL_RATE_LIMIT_MAX_WAIT', default=10, cast=float)
+EMAIL_RATE_LIMIT_RETRY_DELAY = config('EMAIL_RATE_LIMIT_RETRY_DELAY', default=30, cast=int)
+EMAIL_RATE_LIMIT_REDIS_URL = config('EMAIL_RATE_LIMIT_REDIS_URL', default=CELERY_BROKER_URL)
+
+# Redis holding the per-member send key reservations that keep overlapping
+# campaign runs from emailing the same member twice in a period
+EMAIL_SEND_KEY_REDIS_URL = config('EMAIL_SEND_KEY_REDIS_URL', default=CELERY_BROKER_URL)
+
+# Live campaign progress counters (api/emails/status/<task_id>/), kept for a day
+EMAIL_PROGRESS_REDIS_URL = config('EMAIL_PROGRESS_REDIS_URL', default=CELERY_BROKER_URL)
+EMAIL_PROGRESS_TTL = 86400
+
+# Failed sends are retried with exponential backoff (seconds) and jitter, up to
+# EMAIL_RETRY_MAX_ATTEMPTS attempts in total including the first one
+EMAIL_RETRY_MAX_ATTEMPTS = config('EMAIL_RETRY_MAX_ATTEMPTS', default=5, cast=int)
+EMAIL_RETRY_BASE_DELAY = config('EMAIL_RETRY_BASE_DELAY', default=60, cast=int)
+EMAIL_RETRY_MAX_DELAY = config('EMAIL_RETRY_MAX_DELAY', default=3600, cast=int)
+EMAIL_RETRY_LEASE = 600
+EMAIL_RETRY_SWEEP_GRACE = 300
+
+# Members a campaign dry run processes before projecting onto the full list
+EMAIL_DRY_RUN_SAMPLE_SIZE = config('EMAIL_DRY_RUN_SAMPLE_SIZE', default=1000, cast=int)
+
+# EmailLog rows older than EMAIL_LOG_RETENTION_DAYS are moved to monthly
+# gzipped JSON-lines files in EMAIL_LOG_ARCHIVE_DIR by a nightly task
+EMAIL_LOG_RETENTION_DAYS = config('EMAIL_LOG_RETENTION_DAYS', default=180, cast=int)
+EMAIL_LOG_ARCHIVE_DIR = config('EMAIL_LOG_ARCHIVE_DIR', default=str(BASE_DIR / 'archive' / 'email_logs'))
+EMAIL_LOG_ARCHIVE_BATCH_SIZE = 5000
+
+# Cache (Redis, shared by web and worker processes)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': config('CACHE_URL', default='redis://localhost:6379/1'),
+        'KEY_PREFIX': 'gym',
+    }
+}
+
+# Seconds the member stats endpoint serves cached counts; member changes
+# invalidate them sooner
+MEMBER_STATS_CACHE_TTL = config('MEMBER_STATS_CACHE_TTL', default=60, cast=int)
+
+# Seconds a member dashboard payload stays cached; the member's own
+# writes (workouts, check-ins, sessions, plans) retire it sooner
+MEMBER_DASHBOARD_CACHE_TTL = config('MEMBER_DASHBOARD_CACHE_TTL', default=300, cast=int)
+
+# Members inserted per bulk_create statement by the bulk upload
+MEMBER_IMPORT_BATCH_SIZE = config('MEMBER_IMPORT_BATCH_SIZE', default=1000, cast=int)
+# Rows an import job commits (and checkpoints) at a time, and how many
+# row errors it keeps for the job endpoint
+MEMBER_IMPORT_CHUNK_SIZE = config('MEMBER_IMPORT_CHUNK_SIZE', default=5000, cast=int)
+MEMBER_IMPORT_MAX_ERRORS = 1000
+# Seconds an import job stays claimed by its worker without progress
+# before another worker may take it over
+MEMBER_IMPORT_LEASE = 600
+
+# Longest range the stats history endpoint serves in one request
+STATS_HISTORY_MAX_DAYS = 366
+
 # API Documentation
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Gym Automation API',
@@ -20,5 +20,12 @@ ALLOWED_HOSTS = ['*']
 if not config('SENDGRID_API_KEY', default=''):
     EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
+# Local memory cache so development runs without a Redis cache
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 # Disable HTTPS redirect in development
 SECURE_SSL_REDIRECT = False
\ No newline at end of file